@@ -2,6 +2,8 @@ import bpy
 
 from .asset_ops import QARCH_OT_add_asset
 from .asset_props import AssetProperty
+from .asset_previews import PREVIEWS
+from .asset_library import save_libraries
 
 classes = (AssetProperty, QARCH_OT_add_asset)
 
@@ -9,8 +11,13 @@ classes = (AssetProperty, QARCH_OT_add_asset)
 def register_asset():
     for cls in classes:
         bpy.utils.register_class(cls)
+    bpy.app.timers.register(save_libraries, persistent=True)
 
 
 def unregister_asset():
     for cls in classes:
         bpy.utils.unregister_class(cls)
+    PREVIEWS.clear()
+    if bpy.app.timers.is_registered(save_libraries):
+        bpy.app.timers.unregister(save_libraries)
+    save_libraries()
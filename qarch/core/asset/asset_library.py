@@ -0,0 +1,119 @@
+import os
+import json
+import time
+
+MANIFEST_NAME = ".qarch_manifest.json"
+MANIFEST_VERSION = 1
+REFRESH_INTERVAL = 5.0  # seconds, between mtime checks of the same directory
+SAVE_INTERVAL = 10.0  # seconds, between saves of changed manifests, see save_libraries
+
+
+class AssetLibrary:
+    """ Index of a Chocofur style asset library (asset type/category/asset.blend, thumbnails in
+        category/renders), kept in a manifest file at the root of the library. A directory is
+        listed again only when its mtime changed, and its mtime is checked at most every
+        REFRESH_INTERVAL seconds, everything else is served from memory. Changes are only
+        written to the manifest by save(), never while listing.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.manifest_path = os.path.join(path, MANIFEST_NAME)
+        self.dirs = self.read_manifest()
+        self.checked = {}
+        self.dirty = False
+
+    def read_manifest(self):
+        try:
+            with open(self.manifest_path) as f:
+                manifest = json.load(f)
+        except (OSError, ValueError):
+            return {}
+        if manifest.get("version") != MANIFEST_VERSION:
+            return {}
+        return manifest.get("dirs", {})
+
+    def write_manifest(self):
+        """ Save the manifest through a temporary file, so it is never seen half written.
+            Ignored if the library is read-only
+        """
+        tmp_path = "{}.{}.tmp".format(self.manifest_path, os.getpid())
+        try:
+            with open(tmp_path, "w") as f:
+                json.dump({"version": MANIFEST_VERSION, "dirs": self.dirs}, f)
+            os.replace(tmp_path, self.manifest_path)
+        except OSError:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+
+    def save(self):
+        """ Write the manifest if any directory was scanned again since the last save
+        """
+        if self.dirty:
+            self.dirty = False
+            self.write_manifest()
+
+    def mtime(self, *parts):
+        try:
+            return os.stat(os.path.join(self.path, *parts)).st_mtime
+        except OSError:
+            return None
+
+    def entries(self, key, mtimes, scan):
+        """ Entries of the directory at key, scanned again if any of mtimes (callable) changed
+        """
+        entry = self.dirs.get(key)
+        now = time.monotonic()
+        if entry is not None and now - self.checked.get(key, -REFRESH_INTERVAL) < REFRESH_INTERVAL:
+            return entry["entries"]
+
+        self.checked[key] = now
+        current = mtimes()
+        if entry is None or entry["mtime"] != current:
+            entry = {"mtime": current, "entries": scan() if current[0] is not None else []}
+            self.dirs[key] = entry
+            self.dirty = True
+        return entry["entries"]
+
+    def listdir(self, *parts):
+        return [d for d in os.listdir(os.path.join(self.path, *parts)) if not d.startswith('.')]
+
+    def asset_types(self):
+        return self.entries("", lambda: [self.mtime()], self.listdir)
+
+    def categories(self, asset_type):
+        return self.entries(asset_type, lambda: [self.mtime(asset_type)], lambda: self.listdir(asset_type))
+
+    def assets(self, asset_type, category):
+        """ (name, thumbnail path relative to the category) of every asset in category, thumbnail
+            path is None if it has no render
+        """
+        def scan():
+            directory = os.path.join(self.path, asset_type, category)
+            renders = os.path.join(directory, "renders")
+            thumbs = set(os.listdir(renders)) if os.path.isdir(renders) else set()
+            names = [d[:-6] for d in os.listdir(directory) if not d.startswith('.') and d.endswith('.blend') and not os.path.isdir(os.path.join(directory, d))]
+            return [[name, os.path.join("renders", name + ".jpg") if name + ".jpg" in thumbs else None] for name in names]
+
+        key = "/".join([asset_type, category])
+        return self.entries(key, lambda: [self.mtime(asset_type, category), self.mtime(asset_type, category, "renders")], scan)
+
+
+LIBRARIES = {}
+
+
+def get_library(path):
+    """ AssetLibrary for path, created on first use
+    """
+    if path not in LIBRARIES:
+        LIBRARIES[path] = AssetLibrary(path)
+    return LIBRARIES[path]
+
+
+def save_libraries():
+    """ Save the changed manifests of all libraries, returns the delay until the next save
+        so it can be registered as a timer
+    """
+    for library in LIBRARIES.values():
+        library.save()
+    return SAVE_INTERVAL
@@ -0,0 +1,84 @@
+import os
+from collections import OrderedDict
+
+import bpy.utils.previews
+
+# -- upper bound of what one thumbnail costs once drawn, the large preview plus the icon, both RGBA
+PREVIEW_BYTES = (256 * 256 + 32 * 32) * 4
+
+
+class CategoryPreviews:
+    """ Preview collection of one asset category, with the enum items built from it
+    """
+
+    def __init__(self):
+        self.pcoll = bpy.utils.previews.new()
+        self.assets = None
+        self.items = []
+
+    @property
+    def nbytes(self):
+        return len(self.pcoll) * PREVIEW_BYTES
+
+    def enum_items(self, directory, assets):
+        """ Enum items for assets, thumbnails are only added to the collection when the listing changes
+        """
+        if self.assets is assets:
+            return self.items
+
+        self.items = []
+        for i, (name, thumbnail) in enumerate(assets):
+            icon_id = 0
+            if thumbnail:
+                image_path = os.path.join(directory, thumbnail)
+                thumb = self.pcoll.get(image_path)
+                if not thumb:
+                    thumb = self.pcoll.load(image_path, image_path, 'IMAGE')
+                icon_id = thumb.icon_id
+            self.items.append((name, name, "", icon_id, i))
+        self.assets = assets
+        return self.items
+
+    def release(self):
+        bpy.utils.previews.remove(self.pcoll)
+
+
+class PreviewCache:
+    """ Previews of the most recently browsed categories, least recently browsed ones are released
+        once there are more than max_collections of them or they hold more than max_bytes
+    """
+
+    def __init__(self, max_collections=8, max_bytes=256 * 1024 * 1024):
+        self.max_collections = max_collections
+        self.max_bytes = max_bytes
+        self.categories = OrderedDict()
+
+    def enum_items(self, key, directory, assets):
+        category = self.categories.get(key)
+        if category is None:
+            category = self.categories[key] = CategoryPreviews()
+        self.categories.move_to_end(key)
+        items = category.enum_items(directory, assets)
+        self.evict()
+        return items
+
+    @property
+    def nbytes(self):
+        return sum(category.nbytes for category in self.categories.values())
+
+    def evict(self):
+        """ Release least recently browsed categories until within bounds, the current one is kept
+        """
+        while len(self.categories) > 1 and (
+            len(self.categories) > self.max_collections or self.nbytes > self.max_bytes
+        ):
+            _, category = self.categories.popitem(last=False)
+            category.release()
+
+    def clear(self):
+        for category in self.categories.values():
+            category.release()
+        self.categories.clear()
+
+
+PREVIEWS = PreviewCache()
@@ -1,42 +1,40 @@
 import os, bpy
-import bpy.utils.previews
 from bpy.props import FloatVectorProperty
 
+from .asset_library import get_library
+from .asset_previews import PREVIEWS
+
+# -- Blender needs the strings of dynamic enum items kept alive, items are rebuilt only when the library changes
+ENUM_ITEMS = {}
+
+
+def cached_items(key, entries, build):
+    cached = ENUM_ITEMS.get(key)
+    if cached is None or cached[0] is not entries:
+        cached = ENUM_ITEMS[key] = (entries, build(entries))
+    return cached[1]
+
 def get_asset_types(self, context):
-    directory = context.scene.qarch_settings.libpath
-    if not os.path.exists(directory):
+    libpath = context.scene.qarch_settings.libpath
+    if not libpath:
         return []
-    dirs = [d for d in os.listdir(directory) if not d.startswith('.')]
-    return [(dir,dir,dir) for dir in dirs]
+    types = get_library(libpath).asset_types()
+    return cached_items((libpath,), types, lambda types: [(dir,dir,dir) for dir in types])
 
 def get_categories(self, context):
     if not self.asset_type:
         return []
-    directory = os.path.join(context.scene.qarch_settings.libpath,self.asset_type)
-    dirs = [d for d in os.listdir(directory) if not d.startswith('.')]
-    return [(dir,dir,dir) for dir in dirs]
+    libpath = context.scene.qarch_settings.libpath
+    categories = get_library(libpath).categories(self.asset_type)
+    return cached_items((libpath, self.asset_type), categories, lambda categories: [(dir,dir,dir) for dir in categories])
 
 def get_assets(self, context):
     if not self.category:
         return []
-    directory = os.path.join(context.scene.qarch_settings.libpath,self.asset_type,self.category)
-    dirs = [d[:-6] for d in os.listdir(directory) if not d.startswith('.') and d.endswith('.blend') and not os.path.isdir(os.path.join(directory,d))]
-    images_directory = os.path.join(context.scene.qarch_settings.libpath,self.asset_type,self.category,"renders")
-    collection_id = "{}.{}".format(self.asset_type,self.category)
-    if collection_id in bpy.types.Scene.qarch_preview_collections:
-        pcoll = bpy.types.Scene.qarch_preview_collections[collection_id]
-    else:
-        pcoll = bpy.utils.previews.new()
-    bpy.types.Scene.qarch_preview_collections[collection_id] = pcoll
-    enum_items = []
-    for i,dir in enumerate(dirs):
-        image_path = os.path.join(images_directory, dir+".jpg")
-        thumb = pcoll.get(image_path)
-        if not thumb:
-            thumb = pcoll.load(image_path, image_path, 'IMAGE')
-        enum_items.append((dir,dir,"",thumb.icon_id,i))
-    pcoll.previews = enum_items
-    return enum_items
+    libpath = context.scene.qarch_settings.libpath
+    assets = get_library(libpath).assets(self.asset_type, self.category)
+    directory = os.path.join(libpath,self.asset_type,self.category)
+    return PREVIEWS.enum_items((libpath, self.asset_type, self.category), directory, assets)
 
 
 class AssetProperty(bpy.types.PropertyGroup):
@@ -54,6 +52,7 @@ class AssetProperty(bpy.types.PropertyGroup):
     asset: bpy.props.EnumProperty(name="Asset", items=get_assets)
     track: bpy.props.EnumProperty(name="Track", items=[('X','X','X'),('Y','Y','Y'),('Z','Z','Z'),('-X','-X','-X'),('-Y','-Y','-Y'),('-Z','-Z','-Z')], default="Z")
     up: bpy.props.EnumProperty(name="Up", items=[('X','X','X'),('Y','Y','Y'),('Z','Z','Z')], default="Y")
+    instancer: bpy.props.BoolProperty(name="Single Instancer", default=False, description="Add one object instancing the asset on every face, instead of one object per face")
 
     def init(self):
         self.offset = (0,0,0)
@@ -79,4 +78,6 @@ class AssetProperty(bpy.types.PropertyGroup):
 
         row = layout.row(align=True)
         row.label(text="Up")
-        row.prop(self, "up", expand=True)
\ No newline at end of file
+        row.prop(self, "up", expand=True)
+
+        layout.prop(self, "instancer")
\ No newline at end of file
@@ -1,13 +1,15 @@
 import os, bpy, bmesh
-from mathutils import Vector
+from math import radians, cos, sin
+from mathutils import Vector, Matrix
 from ...utils import (
     link_objects,
+    make_parent,
+    copy_hierarchy,
     set_origin,
     managed_bmesh_edit,
     crash_safe,
     deselect,
     local_xyz,
-    align_obj,
     vec_equal,
     import_blend,
 )
@@ -23,24 +25,79 @@ def add_asset(context, props):
     with managed_bmesh_edit(context.edit_object) as bm:
         faces = [f for f in bm.faces if f.select]
         deselect(faces)
-        for f in faces:
-            if props.asset_type and props.category and props.asset:
-                add_object(f, props.offset, context.scene.qarch_settings.libpath, props.asset_type, props.category, props.asset, props.track, props.up)
+        if props.asset_type and props.category and props.asset:
+            filepath = os.path.join(context.scene.qarch_settings.libpath, props.asset_type, props.category, props.asset + ".blend")
+            placements = face_placements(faces, props.offset, props.track, props.up)
+            if props.instancer:
+                add_instancer(context.edit_object, filepath, props.asset, placements, props.track, props.up)
+            else:
+                add_objects(context.edit_object, filepath, placements)
     return {"FINISHED"}
 
-def add_object(face, offset, libpath, asset_type, category, asset, track, up):
-    filepath = (os.path.join(libpath, asset_type, category, asset + ".blend"))
-
-    objects = import_blend(filepath)
-
-    if vec_equal(face.normal, Vector((0,0,1))):
-        xyz = [Vector((1,0,0)), Vector((0,1,0)), Vector((0,0,1))]
-    elif vec_equal(face.normal, Vector((0,0,-1))):
-        xyz = [Vector((1,0,0)), Vector((0,1,0)), Vector((0,0,-1))]
-    else:
-        xyz = local_xyz(face) 
-    local_offset = xyz[0]*offset.x + xyz[1]*offset.y + xyz[2]*offset.z
-    
-    for obj in objects:
-        obj.matrix_local.translation = face.calc_center_bounds() + local_offset
-        align_obj(obj, face.normal, track=track, up=up)
\ No newline at end of file
+def face_placements(faces, offset, track, up):
+    """ (location, rotation) of the asset on each of faces
+    """
+    placements = []
+    for face in faces:
+        if vec_equal(face.normal, Vector((0,0,1))):
+            xyz = [Vector((1,0,0)), Vector((0,1,0)), Vector((0,0,1))]
+        elif vec_equal(face.normal, Vector((0,0,-1))):
+            xyz = [Vector((1,0,0)), Vector((0,1,0)), Vector((0,0,-1))]
+        else:
+            xyz = local_xyz(face)
+        local_offset = xyz[0]*offset.x + xyz[1]*offset.y + xyz[2]*offset.z
+        placements.append((face.calc_center_bounds() + local_offset, face.normal.to_track_quat(track, up)))
+    return placements
+
+def add_objects(parent, filepath, placements):
+    """ One copy of the asset per placement, the library is loaded once and the copies share its data
+    """
+    if not placements:
+        return
+    templates = import_blend(filepath)
+    copies = [copy_hierarchy(obj) for _ in placements[1:] for obj in templates]
+    link_objects(copies, parent.users_collection)
+    make_parent(copies, parent)
+
+    n = len(templates)
+    objects = templates + copies
+    for i, (location, rotation) in enumerate(placements):
+        for obj in objects[i*n:(i+1)*n]:
+            obj.matrix_local.translation = location
+            obj.rotation_mode = 'QUATERNION'
+            obj.rotation_quaternion = rotation
+
+def add_instancer(parent, filepath, name, placements, track, up, size=0.05):
+    """ One object instancing the asset on a small triangle per placement.
+        Blender rotates face instances by z -> triangle normal and x -> first edge, then by the
+        instanced object's own rotation. The asset keeps the rotation of an asset placed on an
+        upward face, so each triangle is turned by the rotation of its placement relative to that
+    """
+    if not placements:
+        return
+    up_rotation = Vector((0,0,1)).to_track_quat(track, up)
+    to_up = up_rotation.inverted()
+    verts = []
+    for location, rotation in placements:
+        turn = rotation @ to_up
+        x = turn @ Vector((1,0,0))
+        y = (turn @ Vector((0,0,1))).cross(x)
+        # -- first edge along x, centered on location, counterclockwise around the normal
+        for angle in (radians(210), radians(330), radians(90)):
+            verts.append(location + (x*cos(angle) + y*sin(angle))*size)
+    me = bpy.data.meshes.new(name)
+    me.from_pydata(verts, [], [(i, i+1, i+2) for i in range(0, len(verts), 3)])
+    me.update()
+
+    instancer = bpy.data.objects.new(name, me)
+    instancer.instance_type = 'FACES'
+    instancer.show_instancer_for_render = False
+    link_objects([instancer], parent.users_collection)
+    make_parent([instancer], parent)
+
+    # -- relative to the instancer like the per face copies are relative to parent, at its origin
+    for obj in import_blend(filepath):
+        obj.parent = instancer
+        obj.matrix_parent_inverse.identity()
+        obj.rotation_mode = 'QUATERNION'
+        obj.matrix_local = up_rotation.to_matrix().to_4x4() @ Matrix.Diagonal(obj.matrix_basis.to_scale()).to_4x4()
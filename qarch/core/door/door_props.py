@@ -27,6 +27,10 @@ class DoorProperty(bpy.types.PropertyGroup):
         name="Knob", items=[("ROUND", "Round Knob", "", 0), ("STRAIGHT", "Straight Knob", "", 1)], default="ROUND", description="Knob Type"
     )
 
+    share_mesh: BoolProperty(
+        name="Share Mesh", default=False, description="Identical doors share one mesh, only their transforms differ"
+    )
+
     bottom_panel: BoolProperty(
         name="Bottom Panel", default=False, description="Bottom panel"
     )
@@ -71,6 +75,7 @@ class DoorProperty(bpy.types.PropertyGroup):
         col = layout.column(align=True)
         row = col.row(align=True)
         row.prop(self, "knob")
+        col.prop(self, "share_mesh")
 
         # row = col.row(align=True)
         # row.prop(self, "double_door")
@@ -19,7 +19,7 @@ from ...utils import (
     extrude_face_region,
     managed_bmesh,
     managed_bmesh_edit,
-    get_opposite_face,
+    FaceIndex,
     get_relative_offset,
     crash_safe,
     deselect,
@@ -28,6 +28,7 @@ from ...utils import (
     align_obj,
     shrink_face,
     verify_facemaps_for_object,
+    split_faces_instanced,
 )
 
 from ..frame import create_multigroup_hole, create_multigroup_frame_and_dw
@@ -43,30 +44,35 @@ def build_door(context, props):
     with managed_bmesh_edit(context.edit_object) as bm:
         faces = [f for f in bm.faces if f.select]
         deselect(faces)
+        face_index = FaceIndex(bm)
+        opposite_face = face_index.opposite_face(faces[0])
         props.init(
             calc_face_dimensions(faces[0]),
-            calc_face_dimensions(get_opposite_face(faces[0], bm.faces)),
-            get_relative_offset(faces[0], get_opposite_face(faces[0], bm.faces)),
+            calc_face_dimensions(opposite_face),
+            get_relative_offset(faces[0], opposite_face),
             )
-        create_door(bm, faces, props)
+        create_door(bm, faces, props, face_index)
     return {"FINISHED"}
 
 
-def create_door(bm, faces, prop):
+def create_door(bm, faces, prop, face_index=None):
     """Create door from face selection
     """
+    face_index = face_index or FaceIndex(bm)
+    instances = {} if prop.door.share_mesh else None
     for face in faces:
         clamp_count(calc_face_dimensions(face)[0], prop.frame.margin * 2, prop)
         array_faces = subdivide_face_horizontally(bm, face, widths=[prop.size_offset.size.x] * prop.count)
+        face_index.add(array_faces)
         for aface in array_faces:
             normal = aface.normal.copy()
-            dw_faces, arch_faces = create_multigroup_hole(bm, aface, prop.size_offset.size, prop.size_offset.offset, 'd', 1, prop.frame.margin, prop.frame.depth, prop.add_arch, prop.arch, prop.only_hole)
+            dw_faces, arch_faces = create_multigroup_hole(bm, aface, prop.size_offset.size, prop.size_offset.offset, 'd', 1, prop.frame.margin, prop.frame.depth, prop.add_arch, prop.arch, prop.only_hole, face_index)
             if prop.only_hole:
                 bmesh.ops.delete(bm, geom=dw_faces+arch_faces, context="FACES")
             else:
                 (door_faces,door_origins), _, (arch_faces,arch_origins), (frame_faces,frame_origin) = create_multigroup_frame_and_dw(bm, dw_faces, arch_faces, prop.frame, 'd', prop.door, None, prop.add_arch, prop.arch)
                 knobs,knob_origins,knob_scales = add_knobs(door_faces, door_origins, prop.door.thickness, prop.door.knob, prop.door.flip_direction)
-                doors = split_faces(bm, [[f] for f in door_faces], ["Door" for f in door_faces])
+                doors = split_faces_instanced(bm, [[f] for f in door_faces], "Door", door_origins, frame_origin, lambda door: fill_door(door, prop), instances)
                 frame = split_faces(bm, [frame_faces], ["Frame"])[0]
                 # link objects and set origins
                 link_objects([frame], bpy.context.object.users_collection)
@@ -77,8 +83,6 @@ def create_door(bm, faces, prop):
                     # link_objects(knob, bpy.context.object.users_collection)
                     make_parent(knob, door)
                 set_origin(frame, frame_origin)
-                for door,origin in zip(doors,door_origins):
-                    set_origin(door, origin, frame_origin)
 
                 # set knob origin, rotations and scale
                 for knob,origin,scale in zip(knobs,knob_origins,knob_scales):
@@ -98,9 +102,6 @@ def create_door(bm, faces, prop):
                         set_origin(arch, arch_origin)
                     for arch in archs:
                         fill_arch(arch, prop)
-
-                for door in doors:
-                    fill_door(door, prop)
     return True
 
 
@@ -6,7 +6,6 @@ from ...utils import (
     FaceMap,
     filter_invalid,
     filter_geom,
-    map_new_faces,
     add_faces_to_map,
     calc_edge_median,
     calc_face_dimensions,
@@ -14,7 +13,8 @@ from ...utils import (
     filter_horizontal_edges,
     add_facemaps,
     verify_facemaps_for_object,
-    edge_to_cylinder,
+    edge_segment,
+    create_prisms,
     duplicate_faces,
     subdivide_edges,
     local_xyz,
@@ -112,20 +112,23 @@ def fill_bars(bm, obj, face, prop):
     xyz = local_xyz(face)
     add_facemaps([FaceMap.BARS], obj=obj)
 
-    with map_new_faces(bm, FaceMap.BARS, obj):
-        dup_face = duplicate_faces(bm, [face])[0]
-        # horizontal
-        horizontal_edges = subdivide_edges(bm, filter_vertical_edges(face.edges, xyz[2]), xyz[1], [height/(prop.bar_count_x+1)]*(prop.bar_count_x+1))
-        horizontal_faces = list({f for e in horizontal_edges for f in e.link_faces})
-        for edge in horizontal_edges:
-            edge_to_cylinder(bm, edge, prop.bar_radius, xyz[2])
-        bmesh.ops.delete(bm, geom=horizontal_faces, context="FACES")
-        # vertical
-        vertical_edges = subdivide_edges(bm, filter_horizontal_edges(dup_face.edges, xyz[2]), xyz[0], [height/(prop.bar_count_y+1)]*(prop.bar_count_y+1))
-        vertical_faces = list({f for e in vertical_edges for f in e.link_faces})
-        for edge in vertical_edges:
-            edge_to_cylinder(bm, edge, prop.bar_radius, xyz[2])
-        bmesh.ops.delete(bm, geom=vertical_faces, context="FACES")
+    dup_face = duplicate_faces(bm, [face])[0]
+    # horizontal
+    horizontal_edges = subdivide_edges(bm, filter_vertical_edges(face.edges, xyz[2]), xyz[1], [height/(prop.bar_count_x+1)]*(prop.bar_count_x+1))
+    horizontal_faces = list({f for e in horizontal_edges for f in e.link_faces})
+    prisms = create_prisms(bm, [edge_segment(e) for e in horizontal_edges], prop.bar_radius, xyz[2])
+    bmesh.ops.delete(bm, geom=horizontal_faces, context="FACES")
+    # vertical
+    vertical_edges = subdivide_edges(bm, filter_horizontal_edges(dup_face.edges, xyz[2]), xyz[0], [height/(prop.bar_count_y+1)]*(prop.bar_count_y+1))
+    vertical_faces = list({f for e in vertical_edges for f in e.link_faces})
+    prisms += create_prisms(bm, [edge_segment(e) for e in vertical_edges], prop.bar_radius, xyz[2])
+    bmesh.ops.delete(bm, geom=vertical_faces, context="FACES")
+
+    # -- the new faces are the bars, and the duplicate if there were no vertical bars to replace it
+    bar_faces = list({f for verts in prisms for v in verts for f in v.link_faces})
+    if dup_face.is_valid:
+        bar_faces.append(dup_face)
+    add_faces_to_map(bm, [bar_faces], [FaceMap.BARS], obj=obj)
 
 
 def fill_louver(bm, obj, front_face, back_face, prop):
@@ -14,10 +14,12 @@ from ..utils import (
     calc_edge_median,
     subdivide_face_horizontally,
     subdivide_face_vertically,
-    get_opposite_face,
+    FaceIndex,
     get_relative_offset,
     sort_faces,
     get_top_edges,
+    first_along,
+    ElementCenters,
     get_closest_edges,
     filter_geom,
     boundary_edges,
@@ -48,12 +50,8 @@ def create_multigroup_frame_and_dw(bm, dw_faces, arch_faces, frame_prop, compone
     if door_prop and door_prop.double:
         both_door_origins = [
             (
-                common_vert(
-                    sort_edges(f.edges, x)[0], sort_edges(f.edges, y)[0]
-                ).co - door_prop.thickness*(normal if not door_prop.flip_direction else -normal),
-                common_vert(
-                    sort_edges(f.edges, -x)[0], sort_edges(f.edges, y)[0]
-                ).co - door_prop.thickness*(normal if not door_prop.flip_direction else -normal),
+                face_corner(f, x, y).co - door_prop.thickness*(normal if not door_prop.flip_direction else -normal),
+                face_corner(f, -x, y).co - door_prop.thickness*(normal if not door_prop.flip_direction else -normal),
             )
             for f in door_faces
         ]
@@ -61,22 +59,15 @@ def create_multigroup_frame_and_dw(bm, dw_faces, arch_faces, frame_prop, compone
         door_origins = [o for origins in both_door_origins for o in origins]
     else:
         door_origins = [
-            common_vert(
-                sort_edges(f.edges, x if door_prop.hinge=="LEFT" else -x)[0],
-                sort_edges(f.edges, y)[0]
-            ).co - door_prop.thickness*(normal if not door_prop.flip_direction else -normal)
+            face_corner(f, x if door_prop.hinge=="LEFT" else -x, y).co - door_prop.thickness*(normal if not door_prop.flip_direction else -normal)
             for f in door_faces
         ]
 
     if window_prop and window_prop.double:
         both_window_origins = [
             (
-                common_vert(
-                    sort_edges(f.edges, x)[0], sort_edges(f.edges, y)[0]
-                ).co - window_prop.thickness*(normal if not window_prop.flip_direction else -normal),
-                common_vert(
-                    sort_edges(f.edges, -x)[0], sort_edges(f.edges, y)[0]
-                ).co - window_prop.thickness*(normal if not window_prop.flip_direction else -normal),
+                face_corner(f, x, y).co - window_prop.thickness*(normal if not window_prop.flip_direction else -normal),
+                face_corner(f, -x, y).co - window_prop.thickness*(normal if not window_prop.flip_direction else -normal),
             )
             for f in window_faces
         ]
@@ -84,10 +75,7 @@ def create_multigroup_frame_and_dw(bm, dw_faces, arch_faces, frame_prop, compone
         window_origins = [o for origins in both_window_origins for o in origins]
     else:
         window_origins = [
-            common_vert(
-                sort_edges(f.edges, x if window_prop.hinge=="LEFT" else -x)[0],
-                sort_edges(f.edges, y)[0]
-            ).co - window_prop.thickness*(normal if not window_prop.flip_direction else -normal)
+            face_corner(f, x if window_prop.hinge=="LEFT" else -x, y).co - window_prop.thickness*(normal if not window_prop.flip_direction else -normal)
             for f in window_faces
         ]
 
@@ -99,6 +87,13 @@ def create_multigroup_frame_and_dw(bm, dw_faces, arch_faces, frame_prop, compone
     return (filter_invalid(door_faces),door_origins), (filter_invalid(window_faces),bar_faces,window_origins), (filter_invalid(arch_faces),arch_origins), (filter_invalid(frame_faces),frame_origin)
 
 
+def face_corner(face, x, y):
+    """ Vert shared by the edges of face first along x and first along y
+    """
+    centers = ElementCenters()
+    return common_vert(first_along(face.edges, x, centers=centers)[0], first_along(face.edges, y, centers=centers)[0])
+
+
 def create_frame(bm, dw_faces, arch_faces, dws, frame_prop, door_prop, window_prop, add_arch, arch_prop):
     normal = dw_faces[0].normal.copy()
     xyz = local_xyz(dw_faces[0])
@@ -124,7 +119,8 @@ def create_frame(bm, dw_faces, arch_faces, dws, frame_prop, door_prop, window_pr
             frames.extend(fs)
     # create arch faces
     if add_arch:
-        top_edges = sort_edges(get_top_edges({e for f in frames for e in f.edges},n=2*(len(doors)+len(windows))+1),xyz[0])
+        centers = ElementCenters()
+        top_edges = sort_edges(get_top_edges({e for f in frames for e in f.edges},n=2*(len(doors)+len(windows))+1,centers=centers),xyz[0],centers)
         top_face = max(top_edges[0].link_faces, key=lambda f: f.calc_center_bounds().z)
         if arch_prop.curved:
             arc_end_verts = sort_verts(sort_verts(top_face.verts, xyz[1])[2*(len(doors)+len(windows))+2:2*(len(doors)+len(windows))+4],xyz[0])
@@ -249,11 +245,15 @@ def create_window_frame_split(bm, face, count, frame_margin, first=False, last=F
     return v_faces[1::3], v_frames + v_faces[::3] + v_faces[2::3]
 
 
-def create_multigroup_hole(bm, face, size, offset, components, width_ratio, frame_margin, frame_depth, add_arch, arch_prop, only_hole):
-    """ Use properties from SizeOffset to subdivide face into regular quads
+def create_multigroup_hole(bm, face, size, offset, components, width_ratio, frame_margin, frame_depth, add_arch, arch_prop, only_hole, face_index=None):
+    """ Use properties from SizeOffset to subdivide face into regular quads.
+        face_index (FaceIndex of bm) can be shared between calls, to find the opposite face,
+        the faces created here are added to it
     """
     xyz = local_xyz(face)
-    opposite_face = get_opposite_face(face, [f for f in bm.faces if f!=face])
+    face_index = face_index or FaceIndex(bm)
+    opposite_face = face_index.opposite_face(face)
+    created = []
     relative_offset = Vector(get_relative_offset(face, opposite_face))
     wall_thickness = abs(face.normal.dot(face.calc_center_bounds()-opposite_face.calc_center_bounds())) if equal(relative_offset.y, 0) else float("inf")
     wall_width,_ = calc_face_dimensions(face)
@@ -262,7 +262,7 @@ def create_multigroup_hole(bm, face, size, offset, components, width_ratio, fram
     n_doors_comp = len([c for c in parse_components(components) if c["type"]=="door"])
     dw_count = len(parse_components(components))
 
-    f1 = create_multigroup_split(bm, face, size, offset, components, width_ratio, frame_margin)
+    f1 = create_multigroup_split(bm, face, size, offset, components, width_ratio, frame_margin, created)
     a1 = []
     if add_arch:
         top_edges = get_top_edges( {e for f in f1 for e in f.edges}, n=dw_count)
@@ -273,16 +273,21 @@ def create_multigroup_hole(bm, face, size, offset, components, width_ratio, fram
         if arch_prop.curved:
             a1,_ = create_arch(bm, [top_edge], arch_prop.arc_height, arch_prop.arc_offset, arch_prop.resolution, local_xyz(face))
             f1 = [f for f in f1 if f not in a1]
+        created += [a, b] + [f for af in a1 for v in af.verts for f in v.link_faces]
     opposite_offset = Vector((wall_width - offset.x - size.x - ( wall_width/2 - opposite_wall_width/2 - relative_offset.x),offset.y))
-    s1 = sort_edges(get_top_edges(boundary_edges(f1+a1), n=len(boundary_edges(f1+a1))-n_doors_comp),xyz[0])
+    b1 = boundary_edges(f1+a1)
+    centers = ElementCenters()
+    s1 = sort_edges(get_top_edges(b1, n=len(b1)-n_doors_comp, centers=centers),xyz[0],centers)
     if not only_hole:
-        s1,_ = extrude_edges(bm, s1, -f1[0].normal, min(frame_depth, wall_thickness))
+        s1,side_faces = extrude_edges(bm, s1, -f1[0].normal, min(frame_depth, wall_thickness))
+        created += side_faces
 
     if relative_offset.length < 0.5:
-        f2 = create_multigroup_split(bm, opposite_face, size, opposite_offset, reversed(components), width_ratio, frame_margin)
+        f2 = create_multigroup_split(bm, opposite_face, size, opposite_offset, reversed(components), width_ratio, frame_margin, created)
         a2 = []
         if add_arch:
-            top_edges = sort_edges(get_top_edges({e for f in f2 for e in f.edges},n=dw_count),xyz[0])
+            centers = ElementCenters()
+            top_edges = sort_edges(get_top_edges({e for f in f2 for e in f.edges},n=dw_count,centers=centers),xyz[0],centers)
             top_face = max(top_edges[0].link_faces, key=lambda f: f.calc_center_bounds().z)
             a,b = subdivide_face_vertically(bm, top_face, [arch_prop.straight_height,calc_face_dimensions(top_face)[1]-arch_prop.straight_height])
             a2 = [a]
@@ -290,25 +295,32 @@ def create_multigroup_hole(bm, face, size, offset, components, width_ratio, fram
             if arch_prop.curved:
                 a2,_ = create_arch(bm, [top_edge], arch_prop.arc_height, arch_prop.arc_offset, arch_prop.resolution, local_xyz(opposite_face))
                 f2 = [f for f in f2 if f not in a2]
-        s2 = get_top_edges(boundary_edges(f2+a2), n=len(boundary_edges(f2+a2))-n_doors_comp)
+            created += [a, b] + [f for af in a2 for v in af.verts for f in v.link_faces]
+        b2 = boundary_edges(f2+a2)
+        s2 = get_top_edges(b2, n=len(b2)-n_doors_comp)
         for e1 in s1:
             e2 = get_closest_edges(e1, s2)[0]
-            bmesh.ops.contextual_create(bm, geom=list(e1.verts)+list(e2.verts))
+            created += bmesh.ops.contextual_create(bm, geom=list(e1.verts)+list(e2.verts))["faces"]
         bmesh.ops.delete(bm, geom=list(set(f2+a2)), context="FACES")
 
     # add depth to frame faces
     dup_faces = filter_geom(bmesh.ops.duplicate(bm, geom=list(set(f1+a1)))["geom"], BMFace)
     bmesh.ops.translate(bm, vec=-f1[0].normal*frame_depth, verts=list({v for f in dup_faces for v in f.verts}))
     bmesh.ops.delete(bm, geom=list(set(f1+a1)), context="FACES")
+    face_index.add(created + dup_faces)
     xyz = local_xyz(dup_faces[0])
     if add_arch:
-        dw_faces,arch_faces = sort_faces(dup_faces,xyz[1])[:-1], [sort_faces(dup_faces,xyz[1])[-1]]
+        sorted_faces = sort_faces(dup_faces,xyz[1])
+        dw_faces,arch_faces = sorted_faces[:-1], [sorted_faces[-1]]
     else:
         dw_faces,arch_faces=dup_faces,[]
     return sort_faces(dw_faces, xyz[0]), arch_faces
 
 
-def create_multigroup_split(bm, face, size, offset, components, width_ratio, frame_margin):
+def create_multigroup_split(bm, face, size, offset, components, width_ratio, frame_margin, created=None):
+    """ Split the door/window faces out of face, the pieces of face are appended to created
+    """
+    created = [] if created is None else created
     direction,_,_ = local_xyz(face)
     wall_w, wall_h = calc_face_dimensions(face)
     # horizontal split
@@ -327,7 +339,9 @@ def create_multigroup_split(bm, face, size, offset, components, width_ratio, fra
     # adjacent doors/windows clubbed
     clubbed_widths = [clubbed_width(door_width, window_width, frame_margin, dw['type'], dw['count'], i == 0, i == len(dws)-1) for i, dw in enumerate(dws)]
     clubbed_faces = subdivide_face_horizontally(bm, v_faces[0], clubbed_widths)
-    faces = [f if dw['type']=='door' else subdivide_face_vertically(bm, f, [offset.y, size.y])[1] for dw,f in zip(dws, clubbed_faces)]
+    dw_splits = [[f] if dw['type']=='door' else subdivide_face_vertically(bm, f, [offset.y, size.y]) for dw,f in zip(dws, clubbed_faces)]
+    faces = [fs[0] if dw['type']=='door' else fs[1] for dw,fs in zip(dws, dw_splits)]
+    created += h_faces + v_faces + clubbed_faces + [f for fs in dw_splits for f in fs]
 
     return sort_faces(faces, direction)
 
@@ -10,6 +10,7 @@ from ..utils import (
     create_object_material,
     bmesh_from_active_object,
     set_material_for_active_facemap,
+    clear_face_map_indices,
 )
 
 
@@ -134,8 +135,13 @@ def register_material():
         bpy.utils.register_class(cls)
 
     bpy.types.Object.facemap_materials = CollectionProperty(type=FaceMapMaterial)
+    bpy.app.handlers.load_post.append(clear_face_map_indices)
 
 
 def unregister_material():
     for cls in classes:
         bpy.utils.unregister_class(cls)
+
+    if clear_face_map_indices in bpy.app.handlers.load_post:
+        bpy.app.handlers.load_post.remove(clear_face_map_indices)
+    clear_face_map_indices()
@@ -16,13 +16,14 @@ from ...utils import (
     set_origin,
     calc_face_dimensions,
     managed_bmesh_edit,
-    get_opposite_face,
+    FaceIndex,
     get_relative_offset,
     crash_safe,
     deselect,
     align_obj,
     managed_bmesh,
     verify_facemaps_for_object,
+    split_faces_instanced,
 )
 from ..validations import validate, some_selection, ngon_validation, same_dimensions
 
@@ -36,18 +37,21 @@ def build_multigroup(context, props):
     with managed_bmesh_edit(context.edit_object) as bm:
         faces = [f for f in bm.faces if f.select]
         deselect(faces)
+        face_index = FaceIndex(bm)
+        opposite_face = face_index.opposite_face(faces[0])
         props.init(
             calc_face_dimensions(faces[0]),
-            calc_face_dimensions(get_opposite_face(faces[0], bm.faces)),
-            get_relative_offset(faces[0], get_opposite_face(faces[0], bm.faces)),
+            calc_face_dimensions(opposite_face),
+            get_relative_offset(faces[0], opposite_face),
             )
-        create_multigroup(bm, faces, props)
+        create_multigroup(bm, faces, props, face_index)
     return {"FINISHED"}
 
 
-def create_multigroup(bm, faces, prop):
+def create_multigroup(bm, faces, prop, face_index=None):
     """ Create multigroup from face selection
     """
+    face_index = face_index or FaceIndex(bm)
 
     # Prevent error when there are no components
     if len(prop.components) == 0:
@@ -58,19 +62,22 @@ def create_multigroup(bm, faces, prop):
     if not re.match("^[dw]*$", prop.components):
         prop.components = re.sub("[^d|w|]", "", prop.components)
 
+    door_instances = {} if prop.door.share_mesh else None
+    window_instances = {} if prop.window.share_mesh else None
     for face in faces:
         array_faces = subdivide_face_horizontally(bm, face, widths=[prop.size_offset.size.x]*prop.count)
+        face_index.add(array_faces)
         for aface in array_faces:
             normal = aface.normal.copy()
-            dw_faces,arch_faces = create_multigroup_hole(bm, aface, prop.size_offset.size,  prop.size_offset.offset, prop.components, prop.width_ratio if prop.different_widths else 1, prop.frame.margin, prop.frame.depth, prop.add_arch, prop.arch, prop.only_hole)
+            dw_faces,arch_faces = create_multigroup_hole(bm, aface, prop.size_offset.size,  prop.size_offset.offset, prop.components, prop.width_ratio if prop.different_widths else 1, prop.frame.margin, prop.frame.depth, prop.add_arch, prop.arch, prop.only_hole, face_index)
             if prop.only_hole:
                 bmesh.ops.delete(bm, geom=dw_faces+arch_faces, context="FACES")
             else:
                 (door_faces,door_origins), (window_faces,bar_faces,window_origins), (arch_faces,arch_origins), (frame_faces,frame_origin) = create_multigroup_frame_and_dw(bm, dw_faces, arch_faces, prop.frame, prop.components, prop.door, prop.window, prop.add_arch, prop.arch)
                 knobs,knob_origins,knob_scales = add_knobs(door_faces, door_origins, prop.door.thickness, prop.door.knob, prop.door.flip_direction)
                 handles,handle_origins,handle_scales = add_handles(window_faces, window_origins, prop.window.thickness, prop.window.handle, prop.window.flip_direction)
-                doors = split_faces(bm, [[f] for f in door_faces], ["Door" for f in door_faces])
-                windows = split_faces(bm, [[f] for f in window_faces], ["Window" for f in window_faces])
+                doors = split_faces_instanced(bm, [[f] for f in door_faces], "Door", door_origins, frame_origin, lambda door: fill_door(door, prop), door_instances)
+                windows = split_faces_instanced(bm, [[f] for f in window_faces], "Window", window_origins, frame_origin, lambda window: fill_window(window, prop), window_instances)
                 frame = split_faces(bm, [frame_faces], ["Frame"])[0]
 
                 # link objects and set origins
@@ -82,13 +89,9 @@ def create_multigroup(bm, faces, prop):
                 for knob,door in zip(knobs,doors):
                     # link_objects(knob, door)
                     make_parent(knob, door)
-                for door,origin in zip(doors,door_origins):
-                    set_origin(door, origin, frame_origin)
                 for handle,window in zip(handles,windows):
                     # link_objects(handle, window)
                     make_parent(handle, window)
-                for window,origin in zip(windows,window_origins):
-                    set_origin(window, origin, frame_origin)
 
                 # create bars
                 if prop.window.add_bars:
@@ -122,10 +125,5 @@ def create_multigroup(bm, faces, prop):
                         set_origin(arch, arch_origin)
                     for arch in archs:
                         fill_arch(arch, prop)
-
-                for door in doors:
-                    fill_door(door, prop)
-                for window in windows:
-                    fill_window(window, prop)
     return True
 
@@ -1,7 +1,7 @@
 import math
 import bmesh
 from collections import namedtuple
-from bmesh.types import BMFace, BMEdge, BMVert
+from bmesh.types import BMFace, BMVert
 from mathutils import Vector, Matrix, Quaternion
 from ...utils import (
     clamp,
@@ -20,7 +20,8 @@ from ...utils import (
     managed_bmesh,
     verify_facemaps_for_object,
     add_faces_to_map,
-    edge_to_cylinder,
+    edge_segment,
+    create_prisms,
     radius_to_side_length,
 )
 
@@ -53,14 +54,8 @@ def create_railing(railings, prop, normal):
 
 # @map_new_faces(FaceMap.RAILING_POSTS)
 def make_corner_posts(bm, edges, prop, up):
-    posts = []
-    for edge in edges:
-        ret = bmesh.ops.duplicate(bm, geom=[edge])
-        dup_edge = filter_geom(ret["geom"], BMEdge)[0]
-        post = edge_to_cylinder(bm, dup_edge, prop.corner_post_width / 2, up, fill=True)
-        # posts.append(list({f for v in post for f in v.link_faces}))
-        posts += post
-    return list({f for v in posts for f in v.link_faces})
+    posts = create_prisms(bm, [edge_segment(e) for e in edges], prop.corner_post_width / 2, up, fill=True)
+    return list({f for post in posts for v in post for f in v.link_faces})
 
 
 def make_fill(bm, face, prop):
@@ -93,16 +88,14 @@ def make_fill(bm, face, prop):
 
 # @map_new_faces(FaceMap.RAILING_RAILS)
 def create_railing_top(bm, top_edge, prop):
-    ret = bmesh.ops.duplicate(bm, geom=[top_edge])
-    top_dup_edge = filter_geom(ret["geom"], BMEdge)[0]
-    vec = edge_vector(top_dup_edge)
+    vec = edge_vector(top_edge)
 
     up = vec.copy()
     horizon = vec.cross(Vector((0., 0., 1.)))
     up.rotate(Quaternion(horizon, math.pi/2).to_euler())
 
-    sloped = edge_is_sloped(top_dup_edge)
-    cylinder = edge_to_cylinder(bm, top_dup_edge, prop.corner_post_width/2, up)
+    sloped = edge_is_sloped(top_edge)
+    cylinder = create_prisms(bm, [edge_segment(top_edge)], prop.corner_post_width/2, up)[0]
     if sloped:
         rotate_sloped_rail_bounds(bm, cylinder, vec)
 
@@ -130,12 +123,9 @@ def create_fill_posts(bm, face, prop):
         inner_edges = subdivide_edges(
             bm, [top_edge, bottom_edge], dir, widths=[1.0] * (n_posts + 1)
         )
-        for edge in inner_edges:
-            ret = bmesh.ops.duplicate(bm, geom=[edge])
-            dup_edge = filter_geom(ret["geom"], BMEdge)[0]
-            up = face.normal
-            vec = edge_vector(dup_edge)
-            cylinder = edge_to_cylinder(bm, dup_edge, prop.post_fill.size/2, up, n=prop.post_fill.segments)
+        cylinders = create_prisms(bm, [edge_segment(e) for e in inner_edges], prop.post_fill.size/2, face.normal, n=prop.post_fill.segments)
+        for edge, cylinder in zip(inner_edges, cylinders):
+            vec = edge_vector(edge)
             if sloped:
                 rotate_top_faces(bm, cylinder, vec, dir)
             result += list({f for v in cylinder for f in v.link_faces})
@@ -161,14 +151,10 @@ def create_fill_rails(bm, face, prop):
         inner_edges = subdivide_edges(
             bm, vertical_edges, Vector((0.0, 0.0, 1.0)), widths=[1.0] * (n_rails + 1)
         )
-        for edge in inner_edges:
-            ret = bmesh.ops.duplicate(bm, geom=[edge])
-            dup_edge = filter_geom(ret["geom"], BMEdge)[0]
-            up = face.normal
-
-            vec = edge_vector(dup_edge)
-            sloped = edge_is_sloped(dup_edge)
-            cylinder = edge_to_cylinder(bm, dup_edge, rail_size / 2, up, n=prop.rail_fill.segments)
+        cylinders = create_prisms(bm, [edge_segment(e) for e in inner_edges], rail_size / 2, face.normal, n=prop.rail_fill.segments)
+        for edge, cylinder in zip(inner_edges, cylinders):
+            vec = edge_vector(edge)
+            sloped = edge_is_sloped(edge)
             if sloped:
                 rotate_sloped_rail_bounds(bm, cylinder, vec)
             result += list({f for v in cylinder for f in v.link_faces})
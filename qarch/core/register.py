@@ -65,12 +65,8 @@ def register_core():
     for func in register_funcs:
         func()
     bpy.types.Scene.qarch_settings = bpy.props.PointerProperty(type=QuickArchSettings)
-    bpy.types.Scene.qarch_preview_collections = {}
 
 def unregister_core():
     for func in unregister_funcs:
         func()
-    for pcoll in bpy.types.Scene.qarch_preview_collections.values():
-        bpy.utils.previews.remove(pcoll)
     del bpy.types.Scene.qarch_settings
-    del bpy.types.Scene.qarch_preview_collections
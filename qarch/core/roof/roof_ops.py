@@ -17,7 +17,11 @@ class QARCH_OT_add_roof(bpy.types.Operator):
         return context.object is not None and context.mode == "EDIT_MESH"
 
     def execute(self, context):
-        return build_roof(context, self.props)
+        timings = {}
+        result = build_roof(context, self.props, timings)
+        if bpy.app.debug and timings:
+            self.report({"INFO"}, "Roof " + ", ".join("{} {:.1f}ms".format(k, t * 1000) for k, t in timings.items()))
+        return result
 
     def draw(self, context):
         self.props.draw(context, self.layout)
@@ -7,14 +7,17 @@ from ...utils import (
     select,
     filter_invalid,
     edge_vector,
-    skeletonize,
-    set_roof_type_hip,
-    set_roof_type_gable,
+    skeletonize_cached,
+    skeletonize_many,
+    RoofType,
     verify_facemaps_for_object,
     managed_bmesh,
     mean_vector,
-    boundary_edges,
+    FaceSetTopology,
+    VertGrid,
+    EdgeGrid,
     crash_safe,
+    stopwatch,
     managed_bmesh_edit,
     deselect,
 )
@@ -24,80 +27,112 @@ from ..roof_top.roof_top_types import create_roof_top
 
 @crash_safe
 @validate([some_selection, flat_face_validation], ["No faces seleted", "Roof creation not supported on non-flat n-gon!"])
-def build_roof(context, props):
+def build_roof(context, props, timings=None):
     """ Create Roof from context and prop, with validations. Intented to be called directly from operator.
+        Time spent in each stage is added to timings, when given.
     """
     verify_facemaps_for_object(context.object)
     with managed_bmesh_edit(context.edit_object) as bm:
         faces = [f for f in bm.faces if f.select]
         deselect(faces)
-        top_faces = create_roof(bm, faces, props)
+        top_faces = create_roof(bm, faces, props, timings)
     return {"FINISHED"}
 
 
-def create_roof(bm, faces, props):
+def create_roof(bm, faces, props, timings=None, workers=1):
     """Create roof types
     """
     roof_origin = mean_vector([f.calc_center_bounds() for f in faces])
     if props.type == "GABLE":
-        top_faces = create_gable_roof(bm, faces, props)
+        top_faces = create_gable_roof(bm, faces, props, timings, workers)
     elif props.type == "HIP":
-        top_faces = create_hip_roof(bm, faces, props)
+        top_faces = create_hip_roof(bm, faces, props, timings, workers)
     if props.add_roof_top:
         create_roof_top(bm, top_faces, props.roof_top_prop)
     return top_faces
 
 
-def create_gable_roof(bm, faces, prop):
+def create_gable_roof(bm, faces, prop, timings=None, workers=1):
     """ Create gable roof
     """
-    median = mean_vector([f.calc_center_bounds() for f in faces])
-    original_edges = boundary_edges(faces)
+    return create_skeleton_roof(bm, faces, prop, RoofType.GABLE_ROOF, timings, workers)
 
-    # -- get verts in anti-clockwise order (required by straight skeleton)
-    verts = [v for v in reversed(sort_verts_clockwise(original_edges))]
-    clean_verts = [v for i,v in enumerate(verts) if not equal(vert_angle(v, verts[i-1], verts[(i+1)%len(verts)]), math.pi)]
-    points = [v.co.to_tuple()[:2] for v in clean_verts]
 
-    # -- compute straight skeleton
-    set_roof_type_gable()
-    skeleton = skeletonize(points, [])
-    height_scale = prop.height / max([arc.height for arc in skeleton])
+def create_hip_roof(bm, faces, prop, timings=None, workers=1):
+    """Create a hip roof
+    """
+    return create_skeleton_roof(bm, faces, prop, RoofType.HIP_ROOF, timings, workers)
 
-    # -- create edges and vertices
-    skeleton_edges = create_skeleton_verts_and_edges(
-        bm, skeleton, original_edges, median, height_scale
-    )
 
-    # -- create faces
-    top_faces = create_skeleton_faces(bm, clean_verts, skeleton_edges, original_edges)
-    return [f for f in top_faces if f.normal.z > 0.001]
+def create_skeleton_roof(bm, faces, prop, roof_type, timings=None, workers=1):
+    """ Create a roof of roof_type on every island of faces. Skeletons of all islands are
+        computed (in workers processes, if more than one) before any of them is written to bm
+    """
+    footprints = []
+    for island in FaceSetTopology(faces).islands:
+        median = mean_vector([f.calc_center_bounds() for f in island])
+        topology = FaceSetTopology(island)
+        original_edges = topology.boundary_edges
+
+        # -- get outer verts in anti-clockwise and hole verts in clockwise order (required by straight skeleton)
+        outer_verts, hole_verts = footprint_loops(topology.boundary_loops)
+        clean_verts = outer_verts + [v for verts in hole_verts for v in verts]
+        points = [v.co.to_tuple()[:2] for v in outer_verts]
+        holes = [[v.co.to_tuple()[:2] for v in verts] for verts in hole_verts]
+        footprints.append((median, original_edges, clean_verts, (points, holes)))
+
+    # -- compute straight skeletons
+    with stopwatch(timings, "skeleton"):
+        if workers == 1:
+            skeletons = [skeletonize_cached(*footprint, roof_type) for *_, footprint in footprints]
+        else:
+            skeletons = skeletonize_many([footprint for *_, footprint in footprints], roof_type, workers)
+
+    top_faces = []
+    for (median, original_edges, clean_verts, _), skeleton in zip(footprints, skeletons):
+        height_scale = prop.height / max([arc.height for arc in skeleton])
+
+        # -- create edges and vertices
+        with stopwatch(timings, "mesh"):
+            skeleton_edges = create_skeleton_verts_and_edges(
+                bm, skeleton, original_edges, median, height_scale
+            )
+
+        # -- create faces
+        with stopwatch(timings, "faces"):
+            roof_faces = create_skeleton_faces(bm, clean_verts, skeleton_edges, original_edges)
+        top_faces.extend(f for f in roof_faces if f.normal.z > 0.001)
+    return top_faces
 
 
-def create_hip_roof(bm, faces, prop):
-    """Create a hip roof
+def footprint_loops(loops):
+    """ Outer boundary loop (anti clockwise) and the loops of courtyards inside it
+        (clockwise), without verts on straight angles, from the boundary loops of a footprint
     """
-    median = mean_vector([f.calc_center_bounds() for f in faces])
-    original_edges = boundary_edges(faces)
+    def clean(verts):
+        return [v for i,v in enumerate(verts) if not equal(vert_angle(v, verts[i-1], verts[(i+1)%len(verts)]), math.pi)]
+
+    loops = [clean(sort_verts_clockwise(edges)) for edges in loops]
+    outer = max(loops, key=lambda verts: abs(loop_area(verts)))
+    holes = [verts for verts in loops if verts is not outer and point_in_loop(verts[0].co, outer)]
+    return list(reversed(outer)), holes
 
-    # -- get verts in anti-clockwise order (required by straight skeleton)
-    verts = [v for v in reversed(sort_verts_clockwise(original_edges))]
-    clean_verts = [v for i,v in enumerate(verts) if not equal(vert_angle(v, verts[i-1], verts[(i+1)%len(verts)]), math.pi)]
-    points = [v.co.to_tuple()[:2] for v in clean_verts]
 
-    # -- compute straight skeleton
-    set_roof_type_hip()
-    skeleton = skeletonize(points, [])
-    height_scale = prop.height / max([arc.height for arc in skeleton])
+def loop_area(verts):
+    """ Signed area of the loop of verts projected on xy plane
+    """
+    return sum(v.co.x*verts[i-1].co.y - verts[i-1].co.x*v.co.y for i,v in enumerate(verts)) / 2
 
-    # -- create edges and vertices
-    skeleton_edges = create_skeleton_verts_and_edges(
-        bm, skeleton, original_edges, median, height_scale
-    )
 
-    # -- create faces
-    top_faces = create_skeleton_faces(bm, clean_verts, skeleton_edges, original_edges)
-    return [f for f in top_faces if f.normal.z > 0.001]
+def point_in_loop(co, verts):
+    """ Check if co lies inside the loop of verts projected on xy plane (even-odd rule)
+    """
+    inside = False
+    for i,v in enumerate(verts):
+        a, b = verts[i-1].co, v.co
+        if (a.y > co.y) != (b.y > co.y) and co.x < a.x + (co.y-a.y) * (b.x-a.x) / (b.y-a.y):
+            inside = not inside
+    return inside
 
 
 def vert_angle(v, v_prev, v_next):
@@ -109,14 +144,15 @@ def vert_angle(v, v_prev, v_next):
 def sort_verts_clockwise(boundary_edges):
     """ sort verts in anti clockwise direction
     """
-    visited_edges = []
-    e = list(boundary_edges)[0]
+    e = next(iter(boundary_edges))
+    boundary_edges = set(boundary_edges)
+    visited_edges = set()
     v = e.verts[0]
     verts = []
     angle = 0
     while e not in visited_edges:
-        visited_edges.append(e)
-        e_next = [edge for edge in v.link_edges if edge in boundary_edges and edge != e][0]
+        visited_edges.add(e)
+        e_next = next(edge for edge in v.link_edges if edge in boundary_edges and edge != e)
         angle += interior_angle(e.other_vert(v), v , e_next.other_vert(v))
         v = e_next.other_vert(v)
         verts.append(v)
@@ -149,28 +185,33 @@ def create_skeleton_verts_and_edges(bm, skeleton, original_edges, median, height
     """
     skeleton_edges = []
     skeleton_verts = []
+    source_height, sink_height = skeleton_heights(skeleton)
+    # -- skeleton only ever ends at footprint verts or at verts it creates
+    grid = VertGrid({v for e in original_edges for v in e.verts})
     for arc in skeleton:
         source = arc.source
-        vsource = vert_at_loc(source, bm.verts)
+        vsource = vert_at_loc(source, grid.near(source))
         if not vsource:
-            source_height = [arc.height for arc in skeleton if arc.source == source]
-            ht = source_height.pop() * height_scale
+            ht = source_height[loc_key(source)] * height_scale
             vsource = make_vert(bm, Vector((source.x, source.y, median.z + ht)))
+            grid.add(vsource)
             skeleton_verts.append(vsource)
 
         for sink in arc.sinks:
-            vs = vert_at_loc(sink, bm.verts)
+            vs = vert_at_loc(sink, grid.near(sink))
             if not vs:
-                sink_height = min([arc.height for arc in skeleton if sink in arc.sinks])
-                ht = height_scale * sink_height
+                ht = height_scale * sink_height[loc_key(sink)]
                 vs = make_vert(bm, Vector((sink.x, sink.y, median.z + ht)))
+                grid.add(vs)
             skeleton_verts.append(vs)
 
             # create edge
             if vs != vsource:
                 geom = bmesh.ops.contextual_create(bm, geom=[vsource, vs]).get("edges")
                 skeleton_edges.extend(geom)
-    bmesh.ops.remove_doubles(bm, verts=bm.verts, dist=0.0001)
+    # -- merge within this roof only, other islands still hold on to their verts
+    roof_verts = {v for e in original_edges for v in e.verts}.union(skeleton_verts)
+    bmesh.ops.remove_doubles(bm, verts=filter_invalid(roof_verts), dist=0.0001)
 
     skeleton_edges = filter_invalid(skeleton_edges)
     S_verts = {v for e in skeleton_edges for v in e.verts}
@@ -179,6 +220,25 @@ def create_skeleton_verts_and_edges(bm, skeleton, original_edges, median, height
     return join_intersections_and_get_skeleton_edges(bm, skeleton_verts, skeleton_edges)
 
 
+def loc_key(loc, precision=6):
+    """ Hashable xy location, rounded so float noise maps to the same key
+    """
+    return round(loc.x, precision), round(loc.y, precision)
+
+
+def skeleton_heights(skeleton):
+    """ Height of the last arc leaving each source and least height of the arcs reaching
+        each sink, keyed by loc_key
+    """
+    source_height, sink_height = {}, {}
+    for arc in skeleton:
+        source_height[loc_key(arc.source)] = arc.height
+        for sink in arc.sinks:
+            key = loc_key(sink)
+            sink_height[key] = min(arc.height, sink_height.get(key, arc.height))
+    return source_height, sink_height
+
+
 def interior_angle(prev_v, v, next_v):
         """ Determine cross product between two edges with one vert in common. Increases in ACW direction
         """
@@ -193,23 +253,36 @@ def interior_angle(prev_v, v, next_v):
 def create_skeleton_faces(bm, verts, skeleton_edges, original_edges):
     """ Create faces formed from hiproof verts and edges
     """
+    skeleton_edges = set(skeleton_edges)
+    original_edges = set(original_edges)
+    # -- skeleton edges at each vert, in link_edges order
+    skeleton_links = {}
+    for e in skeleton_edges:
+        for v in e.verts:
+            if v not in skeleton_links:
+                skeleton_links[v] = [le for le in v.link_edges if le in skeleton_edges]
 
     def boundary_walk(v, reverse=False):
         """ Perform boundary walk using least interior angle
         """
+        if not skeleton_links.get(v):
+            # -- no arc of the straight skeleton ends at this corner, e.g. a courtyard it failed on
+            raise ValueError("Roof skeleton does not reach every corner of the footprint")
         first = v
         prev = v
-        v = [e for e in v.link_edges if e in skeleton_edges][0].other_vert(v)
+        v = skeleton_links[v][0].other_vert(v)
         walk = [prev, v]
+        walked = {prev, v}
         # traverse on skeleton edges
         while True:
             linked_verts = [
-                e.other_vert(v) for e in v.link_edges if e in skeleton_edges and e.other_vert(v) not in walk
+                e.other_vert(v) for e in skeleton_links.get(v, []) if e.other_vert(v) not in walked
             ]
             if not linked_verts:
                 break
             v, prev = min(linked_verts, key=lambda next: interior_angle(prev, v, next)), v
             walk.append(v)
+            walked.add(v)
         # traverse on original edges
         while v!=first:
             linked_verts = [e.other_vert(v) for e in v.link_edges if e in original_edges and vec_equal((first.co-v.co).normalized(), (e.other_vert(v).co-v.co).normalized())]
@@ -239,9 +312,11 @@ def join_intersecting_verts_and_edges(bm, edges, verts):
         them to that edge
     """
     eps = 0.0001
+    grid = EdgeGrid(edges, eps)
     new_verts = []
+    touched_verts = []
     for v in verts:
-        for e in edges:
+        for e in grid.near(v.co):
             if v in e.verts:
                 continue
 
@@ -256,7 +331,8 @@ def join_intersecting_verts_and_edges(bm, edges, verts):
                 split_factor = (v1.co - v.co).length / e.calc_length()
                 new_edge, new_vert = bmesh.utils.edge_split(e, split_vert, split_factor)
                 new_verts.append(new_vert)
-    bmesh.ops.remove_doubles(bm, verts=bm.verts, dist=0.0001)
+                touched_verts.extend([v, new_vert])
+    bmesh.ops.remove_doubles(bm, verts=filter_invalid(touched_verts), dist=0.0001)
     return filter_invalid(new_verts)
 
 
@@ -46,6 +46,10 @@ class WindowProperty(bpy.types.PropertyGroup):
         name="Handle", items=[("ROUND", "Round Handle", "", 0), ("STRAIGHT", "Straight Handle", "", 1)], default="ROUND", description="Handle Type"
     )
 
+    share_mesh: BoolProperty(
+        name="Share Mesh", default=False, description="Identical windows share one mesh, only their transforms differ"
+    )
+
     add_bars: BoolProperty(name="Add Bars", default=False, description="Bars")
     flip_direction: BoolProperty(name="Flip Direction", default=False, description="Flip door/window directions")
 
@@ -73,3 +77,4 @@ class WindowProperty(bpy.types.PropertyGroup):
         col = layout.column(align=True)
         row = col.row(align=True)
         row.prop(self, "handle")
+        col.prop(self, "share_mesh")
@@ -18,7 +18,7 @@ from ...utils import (
     extrude_face_region,
     managed_bmesh,
     managed_bmesh_edit,
-    get_opposite_face,
+    FaceIndex,
     get_relative_offset,
     crash_safe,
     duplicate_faces,
@@ -28,6 +28,7 @@ from ...utils import (
     align_obj,
     shrink_face,
     verify_facemaps_for_object,
+    split_faces_instanced,
 )
 from ..frame import create_multigroup_hole, create_multigroup_frame_and_dw
 from ..validations import validate, some_selection, ngon_validation, same_dimensions
@@ -42,30 +43,35 @@ def build_window(context, props):
     with managed_bmesh_edit(context.edit_object) as bm:
         faces = [f for f in bm.faces if f.select]
         deselect(faces)
+        face_index = FaceIndex(bm)
+        opposite_face = face_index.opposite_face(faces[0])
         props.init(
             calc_face_dimensions(faces[0]),
-            calc_face_dimensions(get_opposite_face(faces[0], bm.faces)),
-            get_relative_offset(faces[0], get_opposite_face(faces[0], bm.faces)),
+            calc_face_dimensions(opposite_face),
+            get_relative_offset(faces[0], opposite_face),
             )
-        create_window(bm, faces, props)
+        create_window(bm, faces, props, face_index)
     return {"FINISHED"}
 
 
-def create_window(bm, faces, prop):
+def create_window(bm, faces, prop, face_index=None):
     """Generate a window
     """
+    face_index = face_index or FaceIndex(bm)
+    instances = {} if prop.window.share_mesh else None
     for face in faces:
         clamp_count(calc_face_dimensions(face)[0], prop.frame.thickness * 2, prop)
         array_faces = subdivide_face_horizontally(bm, face, widths=[prop.size_offset.size.x]*prop.count)
+        face_index.add(array_faces)
         for aface in array_faces:
             normal = aface.normal.copy()
-            dw_faces, arch_faces = create_multigroup_hole(bm, aface, prop.size_offset.size, prop.size_offset.offset, 'w', 1, prop.frame.margin, prop.frame.depth, prop.add_arch, prop.arch, prop.only_hole)
+            dw_faces, arch_faces = create_multigroup_hole(bm, aface, prop.size_offset.size, prop.size_offset.offset, 'w', 1, prop.frame.margin, prop.frame.depth, prop.add_arch, prop.arch, prop.only_hole, face_index)
             if prop.only_hole:
                 bmesh.ops.delete(bm, geom=dw_faces+arch_faces, context="FACES")
             else:
                 _, (window_faces,bar_faces,window_origins), (arch_faces,arch_origins), (frame_faces,frame_origin) = create_multigroup_frame_and_dw(bm, dw_faces, arch_faces, prop.frame, 'w', None, prop.window, prop.add_arch, prop.arch)
                 handles,handle_origins,handle_scales = add_handles(window_faces, window_origins, prop.window.thickness, prop.window.handle, prop.window.flip_direction)
-                windows = split_faces(bm, [[f] for f in window_faces], ["Window" for f in window_faces])
+                windows = split_faces_instanced(bm, [[f] for f in window_faces], "Window", window_origins, frame_origin, lambda window: fill_window(window, prop), instances)
                 frame = split_faces(bm, [frame_faces], ["Frame"])[0]
                 # link objects and set origins
                 link_objects([frame], bpy.context.object.users_collection)
@@ -76,8 +82,6 @@ def create_window(bm, faces, prop):
                     # link_objects(handle, window)
                     make_parent(handle, window)
                 set_origin(frame, frame_origin)
-                for window,origin in zip(windows,window_origins):
-                    set_origin(window, origin, frame_origin)
 
                 # create bars
                 if prop.window.add_bars:
@@ -103,9 +107,6 @@ def create_window(bm, faces, prop):
                         set_origin(arch, arch_origin)
                     for arch in archs:
                         fill_arch(arch, prop)
-
-                for window in windows:
-                    fill_window(window, prop)
     return True
 
 
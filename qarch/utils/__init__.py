@@ -4,4 +4,4 @@ from .util_common import *
 from .util_object import *
 from .util_geometry import *
 from .util_material import *
-from .util_skeleton import skeletonize, set_roof_type_hip, set_roof_type_gable
+from .util_skeleton import skeletonize, skeletonize_cached, skeletonize_many, RoofType
@@ -5,6 +5,9 @@ from os import devnull
 
 from contextlib import contextmanager, redirect_stderr, redirect_stdout
 
+# -- the benchmarks and checks below stay out of qarch.utils, import them from qarch.utils.devtools
+__all__ = ["profile", "suppress_stdout_stderr"]
+
 
 @contextmanager
 def profile():
@@ -28,3 +31,155 @@ def suppress_stdout_stderr():
     with open(devnull, 'w') as fnull:
         with redirect_stderr(fnull) as err, redirect_stdout(fnull) as out:
             yield (err, out)
+
+
+def terraced_footprint(n_verts, width=6.0, depth=10.0, setback=1.0):
+    """ Footprint of a row of terraced houses, every other one set back, with about n_verts verts.
+        Wound the way skeletonize expects.
+    """
+    front = []
+    for i in range(max(1, (n_verts - 2) // 2)):
+        y = setback if i % 2 else 0.0
+        front += [(i * width, y), ((i + 1) * width, y)]
+    back = [(front[-1][0], depth), (0.0, depth)]
+    return list(reversed(front + back))
+
+
+def benchmark_skeleton(sizes=(50, 500, 5000), roof_types=None, **kwargs):
+    """ Time skeletonize on terraced footprints of the given sizes for each roof type, all of them by default.
+        kwargs are passed on to skeletonize. Prints and returns {(size, roof_type): seconds}
+    """
+    import time
+    from .util_skeleton import RoofType, skeletonize
+
+    roof_types = roof_types or tuple(RoofType)
+    results = {}
+    for size in sizes:
+        polygon = terraced_footprint(size)
+        for roof_type in roof_types:
+            start = time.perf_counter()
+            skeletonize(polygon, [], roof_type, **kwargs)
+            results[size, roof_type] = time.perf_counter() - start
+            print("{:>6} verts  {:<10}  {:.3f}s".format(len(polygon), roof_type.name, results[size, roof_type]))
+    return results
+
+
+def microbenchmark_skeleton(number=100000, size=500):
+    """ Time the hot operations of util_skeleton, per call, and whole skeletons
+        of a terraced footprint with size verts for each backend.
+    """
+    import timeit
+    from .util_skeleton import SkeletonBackend, SLAV, Point2, Vector2, Line2, skeletonize
+
+    p, q = Point2(1.0, 2.0), Point2(4.0, -3.0)
+    v = Vector2(0.3, 0.7)
+    a, b = Line2(p, v), Line2(q, Vector2(-1.0, 0.5))
+    polygon = terraced_footprint(size)
+    vertex = next(v for lav in SLAV(polygon, []) for v in lav if v.is_reflex)
+
+    cases = [
+        ("Vector2 + Vector2", lambda: v + v),
+        ("Point2 - Point2", lambda: p - q),
+        ("Vector2.normalized", v.normalized),
+        ("Vector2.dot", lambda: v.dot(v)),
+        ("hash(Point2)", lambda: hash(p)),
+        ("Line2(Line2)", lambda: Line2(a)),
+        ("Line2.intersect", lambda: a.intersect(b)),
+        ("Line2.distance", lambda: a.distance(q)),
+        ("reflex next_event, {} edges".format(len(polygon)), vertex.next_event),
+    ]
+    results = {}
+    for name, func in cases:
+        n = max(1, number // 1000) if "next_event" in name else number
+        results[name] = timeit.timeit(func, number=n) / n
+        print("{:<32} {:>10.3f} us".format(name, results[name] * 1e6))
+
+    for backend in SkeletonBackend:
+        name = "skeletonize {} verts {}".format(len(polygon), backend.name)
+        results[name] = timeit.timeit(lambda: skeletonize(polygon, [], backend=backend), number=1)
+        print("{:<32} {:>10.3f} s".format(name, results[name]))
+    return results
+
+
+def courtyard_footprint(width, depth, wall):
+    """ Footprint of a width x depth building around a courtyard, with walls of uniform thickness.
+        Wound the way skeletonize expects, returns (polygon, holes)
+    """
+    outer = [(0.0, 0.0), (0.0, depth), (width, depth), (width, 0.0)]
+    hole = [(wall, wall), (width - wall, wall), (width - wall, depth - wall), (wall, depth - wall)]
+    return outer, [hole]
+
+
+def check_courtyard_skeletons(sizes=((10.0, 10.0, 3.0), (20.0, 10.0, 3.0), (30.0, 30.0, 8.0))):
+    """ Check that the skeletons of courtyard footprints, given as (width, depth, wall), reach every
+        corner, for each roof type and backend. Raises RuntimeError on the first one that does not
+    """
+    from .util_skeleton import RoofType, SkeletonBackend, skeletonize, untouched_points
+
+    for width, depth, wall in sizes:
+        polygon, holes = courtyard_footprint(width, depth, wall)
+        for roof_type in RoofType:
+            for backend in SkeletonBackend:
+                skeleton = skeletonize(polygon, holes, roof_type, backend)
+                missed = untouched_points(skeleton, polygon, holes)
+                if missed:
+                    raise RuntimeError("{}x{} courtyard, wall {}, {} {}: skeleton misses {}".format(
+                        width, depth, wall, roof_type.name, backend.name, missed))
+        print("{}x{} courtyard, wall {}: ok".format(width, depth, wall))
+
+
+def benchmark_roof(resolutions=(128, 512, 1024), roof_types=("HIP", "GABLE"), radius=10.0):
+    """ Time the stages of roof creation on elliptic footprints with the given arc resolutions,
+        about two skeleton edges per footprint vert. Prints and returns {(resolution, roof_type): timings}
+    """
+    import bmesh
+    from types import SimpleNamespace
+    from ..core.roof.roof_types import create_gable_roof, create_hip_roof
+
+    builders = {"HIP": create_hip_roof, "GABLE": create_gable_roof}
+    results = {}
+    for resolution in resolutions:
+        for roof_type in roof_types:
+            bm = bmesh.new()
+            bmesh.ops.create_circle(bm, cap_ends=True, segments=resolution, radius=radius)
+            bmesh.ops.scale(bm, vec=(1.0, 0.5, 1.0), verts=bm.verts)
+            timings = {}
+            builders[roof_type](bm, list(bm.faces), SimpleNamespace(height=1.0), timings)
+            bm.free()
+            results[resolution, roof_type] = timings
+            print("{:>6} verts  {:<6}  ".format(resolution, roof_type) + "  ".join(
+                "{} {:.3f}s".format(name, t) for name, t in timings.items()))
+    return results
+
+
+def check_window_instancing(count=2):
+    """ Add a wall with an array of count identical windows sharing meshes, and check that they share one.
+        Returns the windows
+    """
+    import bpy
+    import bmesh
+
+    bpy.ops.mesh.primitive_cube_add(size=1.0)
+    wall = bpy.context.object
+    wall.scale = (4.0, 0.2, 3.0)
+    bpy.ops.object.transform_apply(scale=True)
+    bpy.ops.object.mode_set(mode='EDIT')
+    bm = bmesh.from_edit_mesh(wall.data)
+    for f in bm.faces:
+        f.select_set(f.normal.y < -0.5)
+    bmesh.update_edit_mesh(wall.data)
+    bpy.ops.qarch.add_window(props={"count": count, "window": {"share_mesh": True}})
+    bpy.ops.object.mode_set(mode='OBJECT')
+
+    def descendants(obj):
+        for child in obj.children:
+            yield child
+            yield from descendants(child)
+
+    windows = [obj for obj in descendants(wall) if obj.name.startswith("Window")]
+    meshes = {window.data for window in windows}
+    print("{} windows, {} meshes".format(len(windows), len(meshes)))
+    if len(windows) != count or len(meshes) != 1:
+        raise RuntimeError("{} identical windows have {} meshes, expected {} windows sharing one".format(
+            len(windows), len(meshes), count))
+    return windows
@@ -1,8 +1,10 @@
 import bpy
+import time
 import traceback
 import math
 from math import radians
 from mathutils import Vector, Euler
+from contextlib import contextmanager
 
 
 def equal(a, b, eps=0.001):
@@ -75,6 +77,16 @@ def crash_safe(func):
     return inner
 
 
+@contextmanager
+def stopwatch(timings, name):
+    """ Add the wall time spent in the block to timings[name], if timings is given
+    """
+    start = time.perf_counter()
+    yield
+    if timings is not None:
+        timings[name] = timings.get(name, 0.0) + time.perf_counter() - start
+
+
 def get_limits(wall_dimensions, opposite_wall_dimensions, relative_offset):
     if Vector(relative_offset).length<=0.5:
         left_limit = max(0, wall_dimensions[0]/2-(opposite_wall_dimensions[0]/2-relative_offset[0])) + 0.01
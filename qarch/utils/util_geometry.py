@@ -4,6 +4,7 @@ from mathutils import Matrix, Vector
 
 from .util_mesh import face_with_verts
 from .util_material import verify_facemaps_for_object
+from .util_object import instance_object
 
 
 def cube(bm, width=2, length=2, height=2):
@@ -137,6 +138,42 @@ def new_obj_from_faces(faces, name):
     return obj
 
 
+def faces_key(faces, origin, precision=5):
+    """ Hashable form of faces relative to origin, same for faces that only differ by float noise,
+        the order of their verts and faces or the corner each face starts at
+    """
+    cos = {v: tuple(round(c, precision) for c in v.co - origin) for f in faces for v in f.verts}
+    polygons = []
+    for f in set(faces):
+        corners = [cos[v] for v in f.verts]
+        start = corners.index(min(corners))
+        polygons.append(tuple(corners[start:] + corners[:start]))
+    return tuple(sorted(cos.values())), tuple(sorted(polygons))
+
+
+def split_faces_instanced(original_bm, faces_list, name, origins, parent_origin, fill, instances=None):
+    """ split_faces for objects named name, with their origins set and filled by fill. With instances
+        (a dict kept across calls), faces with the same faces_key as already split ones get an object
+        sharing its mesh, without a mesh of their own being built or filled
+    """
+    objs = []
+    for faces, origin in zip(faces_list, origins):
+        key = faces_key(faces, origin) if instances is not None else None
+        if key in (instances or {}):
+            obj = instance_object(instances[key], name)
+            obj.matrix_local.translation = origin-parent_origin
+        else:
+            obj = new_obj_from_faces(faces, name)
+            verify_facemaps_for_object(obj)
+            set_origin(obj, origin, parent_origin)
+            fill(obj)
+            if instances is not None:
+                instances[key] = obj
+        objs.append(obj)
+    bmesh.ops.delete(original_bm, geom=list({f for faces in faces_list for f in faces}), context="FACES")
+    return objs
+
+
 def set_origin(obj, origin, parent_origin=Vector((0,0,0))):
     obj.data.transform(Matrix.Translation(-origin))
     obj.matrix_local.translation = origin-parent_origin
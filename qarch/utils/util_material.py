@@ -3,6 +3,7 @@ import bmesh
 from enum import Enum, auto
 from functools import wraps
 from contextlib import contextmanager
+from bpy.app.handlers import persistent
 
 from .util_mesh import get_edit_mesh
 from .util_object import bmesh_from_active_object
@@ -42,8 +43,8 @@ class FaceMap(AutoIndex):
 
 def add_faces_to_map(bm, faces_list, facemaps, obj=None):
     obj = obj or bpy.context.object
+    face_map = bm.faces.layers.face_map.active
     for faces, facemap in zip(faces_list, facemaps):
-        face_map = bm.faces.layers.face_map.active
         group_index = face_map_index_from_name(obj, facemap.name.lower())
         for face in faces:
             face[face_map] = group_index
@@ -94,11 +95,28 @@ def set_material_for_active_facemap(material, context):
                 face.material_index = mat_id
 
 
+FACE_MAP_INDICES = {}
+
+
 def face_map_index_from_name(obj, name):
-    for _, fmap in obj.face_maps.items():
-        if fmap.name == name:
-            return fmap.index
-    return -1
+    """ Index of the face map called name in obj, -1 if there is none. Indices are cached per object
+        and looked up again when the face map at the cached index was renamed or removed
+    """
+    indices = FACE_MAP_INDICES.setdefault(obj.as_pointer(), {})
+    index = indices.get(name, -1)
+    face_maps = obj.face_maps
+    if 0 <= index < len(face_maps) and face_maps[index].name == name:
+        return index
+    index = indices[name] = face_maps.find(name)
+    return index
+
+
+@persistent
+def clear_face_map_indices(*args):
+    """ Forget all cached face map indices, registered to run on file load where the objects they
+        were cached for (by pointer) go away
+    """
+    FACE_MAP_INDICES.clear()
 
 
 def link_material(obj, mat):
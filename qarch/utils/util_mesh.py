@@ -1,12 +1,16 @@
 import bpy
 import math
 import bmesh
+import heapq
 import operator
 import functools as ft
-from mathutils import Vector, Quaternion
+import itertools as it
+from mathutils import Vector
+from mathutils.bvhtree import BVHTree
 from bmesh.types import BMVert, BMEdge, BMFace
 from contextlib import contextmanager
-from .util_common import local_xyz, equal, radius_to_side_length
+from collections import defaultdict, Counter
+from .util_common import local_xyz, equal
 
 
 def get_edit_mesh():
@@ -136,7 +140,8 @@ def filter_parallel_edges(edges, dir):
 def calc_edge_median(edge):
     """ Calculate the center position of edge
     """
-    return calc_verts_median(edge.verts)
+    v1, v2 = edge.verts
+    return (v1.co + v2.co) / 2
 
 
 def calc_verts_median(verts):
@@ -156,15 +161,13 @@ def calc_face_dimensions(face):
 
 
 def face_with_verts(bm, verts, default=None):
-    """ Find a face in the bmesh with the given verts
-    """
-    for face in bm.faces:
-        equal = map(
-            operator.eq,
-            sorted(verts, key=operator.attrgetter("index")),
-            sorted(face.verts, key=operator.attrgetter("index")),
-        )
-        if len(face.verts) == len(verts) and all(equal):
+    """ Find a face in the bmesh with the given verts, among the faces linked to them
+    """
+    verts = frozenset(verts)
+    if not verts:
+        return default
+    for face in next(iter(verts)).link_faces:
+        if len(face.verts) == len(verts) and verts.issuperset(face.verts):
             return face
     return default
 
@@ -206,13 +209,8 @@ def subdivide_edge(bm, edge, direction, widths):
     cuts = len(widths) - 1
     res = bmesh.ops.subdivide_edges(bm, edges=[edge], cuts=cuts)
     inner_verts = sort_verts(filter_geom(res.get("geom_split"), BMVert), dir)
-    distance = sum(widths) / len(widths)
-    final_position = 0.0
-    for i in range(cuts):
-        original_position = (i + 1) * distance
-        final_position += widths[i]
-        diff = final_position - original_position
-        bmesh.ops.translate(bm, verts=[inner_verts[i]], vec=diff * dir)
+    for v, diff in zip(inner_verts, cut_offsets(widths)):
+        v.co += diff * dir
     return sort_edges(filter_geom(res.get("geom_split"), BMEdge), dir)
 
 
@@ -224,17 +222,22 @@ def subdivide_edges(bm, edges, direction, widths):
     n_edges = len(edges)
     res = bmesh.ops.subdivide_edges(bm, edges=edges, cuts=cuts)
     inner_edges = sort_edges(filter_geom(res.get("geom_inner"), BMEdge), dir)
-    distance = sum(widths) / len(widths)
-    final_position = 0.0
-    for i in range(cuts):
+    for i, diff in enumerate(cut_offsets(widths)):
         ith_cut = inner_edges[i*(n_edges-1):(i+1)*(n_edges-1)]
-        original_position = (i + 1) * distance
-        final_position += widths[i]
-        diff = final_position - original_position
-        bmesh.ops.translate(bm, verts=list({v for e in ith_cut for v in e.verts}), vec=diff * dir)
+        vec = diff * dir
+        for v in {v for e in ith_cut for v in e.verts}:
+            v.co += vec
     return inner_edges
 
 
+def cut_offsets(widths):
+    """ Distance to move each of the evenly spaced cuts made by subdivide_edges (bmesh.ops),
+        for the parts to have widths
+    """
+    distance = sum(widths) / len(widths)
+    return [position - (i + 1) * distance for i, position in enumerate(it.accumulate(widths[:-1]))]
+
+
 def arc_edge(bm, edge, resolution, arc_height, arc_offset, xyz):
     """ Subdivide the given edge and offset vertices to form an arc
     """
@@ -290,7 +293,8 @@ def extrude_face_region(bm, faces, depth, normal, keep_original=False):
     # order extruded faces as per initially passed
     final_locations = [loc + depth * normal for loc in initial_locations]
     extruded_faces = closest_faces(extruded_faces, final_locations)
-    surrounding_faces = list({f for edge in filter_geom(geom, BMEdge) for f in edge.link_faces if f not in extruded_faces})
+    extruded = set(extruded_faces)
+    surrounding_faces = list({f for edge in filter_geom(geom, BMEdge) for f in edge.link_faces if f not in extruded})
     return extruded_faces, surrounding_faces, (faces if keep_original else [])
 
 
@@ -306,43 +310,59 @@ def duplicate_faces(bm, faces):
     return filter_geom(bmesh.ops.duplicate(bm, geom=faces)["geom"], BMFace)
 
 
-def edge_to_cylinder(bm, edge, radius, up, n=4, fill=False):
-    edge_vec = edge_vector(edge)
-    theta = (n - 2) * math.pi / n
-    length = radius_to_side_length(radius, n)
-
-    dir = up.copy()
-    dir.rotate(Quaternion(edge_vec, -math.pi + theta / 2).to_euler())
-    bmesh.ops.translate(bm, verts=edge.verts, vec=dir * radius)
-    all_verts = [v for v in edge.verts]
-    dir.rotate(Quaternion(edge_vec, math.pi - theta / 2).to_euler())
-    for i in range(0, n):
-        ret = bmesh.ops.extrude_edge_only(bm, edges=[edge])
-        edge = filter_geom(ret["geom"], BMEdge)[0]
-        bmesh.ops.translate(bm, verts=edge.verts, vec=dir * length)
-        dir.rotate(Quaternion(edge_vec, math.radians(360 / n)).to_euler())
-        all_verts += edge.verts
-
-    bmesh.ops.remove_doubles(bm, verts=all_verts, dist=0.001)
+def edge_segment(edge):
+    """ Start and end location of edge
+    """
+    v1, v2 = edge.verts
+    return v1.co.copy(), v2.co.copy()
 
-    if fill:  # fill holes
-        valid_verts = [v for v in all_verts if v.is_valid]
-        sorted_edges = sort_edges({e for v in valid_verts for e in v.link_edges}, edge_vec)
-        top_edges = sorted_edges[-n:]
-        bottom_edges = sorted_edges[:n]
-        bmesh.ops.holes_fill(bm, edges=top_edges)
-        bmesh.ops.holes_fill(bm, edges=bottom_edges)
 
-    return filter_invalid(all_verts)
+def create_prisms(bm, segments, radius, up, n=4, fill=False):
+    """ Create a regular n sided prism of circumradius radius around each (start, end) segment,
+        with sides facing up and -up, and ends capped if fill. Returns the verts of each prism
+    """
+    # -- ring corners are up rotated about the segment, first side runs along up
+    angles = [-math.pi / 2 - math.pi / n + 2 * math.pi * i / n for i in range(n)]
+    trig = [(math.cos(a), math.sin(a)) for a in angles]
+    prisms = []
+    for start, end in segments:
+        axis = (end - start).normalized()
+        across = axis.cross(up)
+        along = axis * axis.dot(up)
+        ring = [radius * (up * c + across * s + along * (1 - c)) for c, s in trig]
+        bottom = [bm.verts.new(start + offset) for offset in ring]
+        top = [bm.verts.new(end + offset) for offset in ring]
+        for i in range(n):
+            bm.faces.new((bottom[i-1], bottom[i], top[i], top[i-1]))
+        if fill:
+            bm.faces.new(reversed(bottom))
+            bm.faces.new(top)
+        prisms.append(bottom + top)
+    return prisms
+
+
+def closest_faces(faces, locations, eps=0.001):
+    """ For each location, the first of faces centered there (within eps), or None
+    """
+    def cell(co):
+        return tuple(math.floor(c / eps) for c in co)
 
+    # -- faces by eps wide cell of their center, any match lies in the 3x3x3 cells around a location
+    cells = defaultdict(list)
+    for i, f in enumerate(faces):
+        center = f.calc_center_bounds()
+        cells[cell(center)].append((i, f, center))
 
-def closest_faces(faces, locations):
-    def get_face(faces, location):
-        for f in faces:
-            if equal((f.calc_center_bounds() - location).length, 0):
-                return f
+    def get_face(location):
+        x, y, z = cell(location)
+        matches = [
+            (i, f) for dx, dy, dz in it.product((-1, 0, 1), repeat=3)
+            for i, f, center in cells.get((x+dx, y+dy, z+dz), [])
+            if equal((center - location).length, 0, eps)
+        ]
+        return min(matches, key=operator.itemgetter(0))[1] if matches else None
 
-    return [get_face(faces, l) for l in locations]
+    return [get_face(l) for l in locations]
 
 
 def create_face(bm, size, offset, xyz):
@@ -358,28 +378,56 @@ def create_face(bm, size, offset, xyz):
     return bmesh.ops.contextual_create(bm, geom=[v1, v2, v3, v4])["faces"][0]
 
 
-def get_top_edges(edges, n=1):
-    return sort_edges(edges, Vector((0, 0, -1)))[:n]
+class ElementCenters(dict):
+    """ Edge medians, face centers and vert locations computed on first use. Share one
+        between sorts of the same elements, for as long as their geometry does not move
+    """
+
+    def __missing__(self, element):
+        if isinstance(element, BMEdge):
+            center = calc_edge_median(element)
+        elif isinstance(element, BMFace):
+            center = element.calc_center_bounds()
+        else:
+            center = element.co.copy()
+        self[element] = center
+        return center
+
+
+def first_along(elements, direction, n=1, centers=None):
+    """ The n elements least far along direction, same as sorting them along direction
+        and taking the first n, without sorting the rest
+    """
+    centers = ElementCenters() if centers is None else centers
+    return heapq.nsmallest(n, elements, key=lambda el: direction.dot(centers[el]))
+
+
+def get_top_edges(edges, n=1, centers=None):
+    return first_along(edges, Vector((0, 0, -1)), n, centers)
 
 
-def get_bottom_edges(edges, n=1):
-    return sort_edges(edges, Vector((0, 0, 1)))[:n]
+def get_bottom_edges(edges, n=1, centers=None):
+    return first_along(edges, Vector((0, 0, 1)), n, centers)
 
 
-def get_top_faces(faces, n=1):
-    return sort_faces(faces, Vector((0, 0, -1)))[:n]
+def get_top_faces(faces, n=1, centers=None):
+    return first_along(faces, Vector((0, 0, -1)), n, centers)
 
 
-def get_bottom_faces(faces, n=1):
-    return sort_faces(faces, Vector((0, 0, 1)))[:n]
+def get_bottom_faces(faces, n=1, centers=None):
+    return first_along(faces, Vector((0, 0, 1)), n, centers)
 
 
-def sort_faces(faces, direction):
-    return sorted(faces, key=lambda f: direction.dot(f.calc_center_bounds()))
+def sort_faces(faces, direction, centers=None):
+    if centers is None:
+        return sorted(faces, key=lambda f: direction.dot(f.calc_center_bounds()))
+    return sorted(faces, key=lambda f: direction.dot(centers[f]))
 
 
-def sort_edges(edges, direction):
-    return sorted(edges, key=lambda e: direction.dot(calc_edge_median(e)))
+def sort_edges(edges, direction, centers=None):
+    if centers is None:
+        return sorted(edges, key=lambda e: direction.dot(calc_edge_median(e)))
+    return sorted(edges, key=lambda e: direction.dot(centers[e]))
 
 
 def sort_verts(verts, direction):
@@ -390,6 +438,55 @@ def get_opposite_face(face, faces, n=1):
     return sorted([f for f in faces if f!=face], key=lambda f:(face.calc_center_bounds()-f.calc_center_bounds()).length)[0]
 
 
+class FaceIndex:
+    """ BVH over the faces of bm, to find opposite faces without sorting the whole mesh. Faces
+        removed since the tree was built are skipped, faces created or reshaped since are passed
+        to add() and compared directly, until there are enough of them to rebuild the tree
+    """
+
+    def __init__(self, bm):
+        self.bm = bm
+        self.build()
+
+    def build(self):
+        self.bm.faces.index_update()
+        self.faces = list(self.bm.faces)
+        self.tree = BVHTree.FromBMesh(self.bm)
+        self.added = []
+
+    def add(self, faces):
+        self.added = [f for f in self.added if f.is_valid]
+        self.added.extend(faces)
+        # -- keeps both the faces compared per query and the rebuilds per face well below linear
+        if len(self.added) > max(32, int(math.sqrt(len(self.faces)))):
+            self.build()
+
+    def ray_hit(self, origin, direction):
+        """ First face of the tree hit by the ray that is still in bm
+        """
+        while True:
+            location, _, index, _ = self.tree.ray_cast(origin, direction)
+            if index is None:
+                return None
+            if self.faces[index].is_valid:
+                return self.faces[index]
+            origin = location + direction * 0.0001
+
+    def opposite_face(self, face):
+        """ Same as get_opposite_face(face, bm.faces). The face hit behind face bounds the
+            distance to search, only faces within it and the added faces are compared
+        """
+        center = face.calc_center_bounds()
+        hit = self.ray_hit(center - face.normal * 0.0001, -face.normal)
+        if hit is None or hit == face:
+            return get_opposite_face(face, self.bm.faces)
+
+        radius = (center - hit.calc_center_bounds()).length + 0.0001
+        nearby = (self.faces[i] for _, _, i, _ in self.tree.find_nearest_range(center, radius))
+        candidates = dict.fromkeys(f for f in it.chain([hit], nearby, self.added) if f.is_valid and f != face)
+        return min(candidates, key=lambda f: (center - f.calc_center_bounds()).length)
+
+
 def get_closest_edges(edge, edges, n=1):
     c = edge.verts[0].co + edge.verts[1].co
     return sorted(edges, key=lambda e:((e.verts[0].co+e.verts[1].co)-c).length)[:n]
@@ -403,8 +500,143 @@ def get_relative_offset(f1, f2):
     d = f1.calc_center_bounds() - f2.calc_center_bounds()
     return -d.dot(x), -d.dot(y)
 
+def edge_face_counts(faces):
+    """ Number of faces (from faces) each of their edges belongs to
+    """
+    return Counter(e for f in faces for e in f.edges)
+
 def boundary_edges(faces):
-    return {e for f in faces for e in f.edges if common_faces(e, faces)<2}
+    return {e for e, count in edge_face_counts(faces).items() if count<2}
+
+
+class FaceSetTopology:
+    """ Per-edge face counts of a face selection, with its boundary, boundary loops and
+        islands worked out on first use
+    """
+
+    def __init__(self, faces):
+        self.faces = list(faces)
+        self.edge_counts = edge_face_counts(self.faces)
+        self._boundary_edges = None
+        self._boundary_loops = None
+        self._islands = None
+
+    @property
+    def boundary_edges(self):
+        if self._boundary_edges is None:
+            self._boundary_edges = {e for e, count in self.edge_counts.items() if count<2}
+        return self._boundary_edges
+
+    @property
+    def boundary_loops(self):
+        if self._boundary_loops is None:
+            self._boundary_loops = boundary_loops(self.boundary_edges)
+        return self._boundary_loops
+
+    @property
+    def islands(self):
+        if self._islands is None:
+            self._islands = face_islands(self.faces)
+        return self._islands
+
+
+class VertGrid:
+    """ Uniform grid over the xy location of verts, cells are eps wide so every vert
+        within eps of a location lies in one of the 3x3 cells around it
+    """
+
+    def __init__(self, verts=(), eps=0.001):
+        self.eps = eps
+        self.cells = defaultdict(list)
+        for v in verts:
+            self.add(v)
+
+    def cell(self, loc):
+        return math.floor(loc.x / self.eps), math.floor(loc.y / self.eps)
+
+    def add(self, vert):
+        self.cells[self.cell(vert.co)].append(vert)
+
+    def near(self, loc):
+        """ Valid verts in the cells around loc, a superset of the verts within eps of it
+        """
+        x, y = self.cell(loc)
+        return [v for i in (-1, 0, 1) for j in (-1, 0, 1) for v in self.cells.get((x+i, y+j), []) if v.is_valid]
+
+
+class EdgeGrid:
+    """ Uniform grid over the xy bounds of edges (grown by eps), each edge is listed in
+        every cell its bounds overlap
+    """
+
+    def __init__(self, edges, eps=0.0001):
+        self.edges = list(edges)
+        self.cells = defaultdict(list)
+        cos = [v.co for e in self.edges for v in e.verts]
+        if not cos:
+            self.size = 1.0
+            return
+
+        extent = max(max(co.x for co in cos) - min(co.x for co in cos), max(co.y for co in cos) - min(co.y for co in cos))
+        self.size = max(extent, eps) / math.sqrt(len(self.edges))
+        for i, e in enumerate(self.edges):
+            a, b = (v.co for v in e.verts)
+            x0, y0 = self.cell(Vector((min(a.x, b.x) - eps, min(a.y, b.y) - eps)))
+            x1, y1 = self.cell(Vector((max(a.x, b.x) + eps, max(a.y, b.y) + eps)))
+            for x in range(x0, x1+1):
+                for y in range(y0, y1+1):
+                    self.cells[x, y].append(i)
+
+    def cell(self, loc):
+        return math.floor(loc.x / self.size), math.floor(loc.y / self.size)
+
+    def near(self, loc):
+        """ Edges whose bounds may hold loc, in the order they were given
+        """
+        return [self.edges[i] for i in self.cells.get(self.cell(loc), [])]
+
+
+def boundary_loops(edges):
+    """ Group boundary edges into sets of connected edges, one for each loop
+    """
+    edges = set(edges)
+    loops = []
+    while edges:
+        stack = [edges.pop()]
+        loop = set(stack)
+        while stack:
+            e = stack.pop()
+            for v in e.verts:
+                for linked in v.link_edges:
+                    if linked in edges:
+                        edges.remove(linked)
+                        loop.add(linked)
+                        stack.append(linked)
+        loops.append(loop)
+    return loops
+
+
+def face_islands(faces):
+    """ Group faces into lists of faces connected through shared edges, one for each island
+    """
+    remaining = set(faces)
+    islands = []
+    for face in faces:
+        if face not in remaining:
+            continue
+        remaining.remove(face)
+        stack = [face]
+        island = []
+        while stack:
+            f = stack.pop()
+            island.append(f)
+            for e in f.edges:
+                for linked in e.link_faces:
+                    if linked in remaining:
+                        remaining.remove(linked)
+                        stack.append(linked)
+        islands.append(island)
+    return islands
 
 def common_faces(edge, faces):
     count = 0
@@ -1,5 +1,6 @@
 import bpy
 import bmesh
+from mathutils import Matrix
 from contextlib import contextmanager
 
 from .util_mesh import select, get_edit_mesh
@@ -54,9 +55,21 @@ def import_obj(path, name):
     return obj
 
 
+# -- (path, linked) -> templates of the objects loaded from path, objects are found again by datablock name
+BLEND_CACHE = {}
+
+
 def import_blend(path, linked=True):
-    """ Import object exported with up=Z and forward=X
+    """ Import object exported with up=Z and forward=X. Each library is loaded once per session,
+        later imports of it are new objects sharing the data of the first ones
     """
+    templates = BLEND_CACHE.get((path, linked))
+    if templates and all(template_resolves(t) for t in templates):
+        parent_objs = [object_from_template(t) for t in templates]
+        link_objects(parent_objs, bpy.context.object.users_collection)
+        make_parent(parent_objs, bpy.context.object)
+        return parent_objs
+
     with bpy.data.libraries.load(path, link=linked) as (data_from, data_to):
         data_to.objects = data_from.objects
         if hasattr(data_from, "groups") and data_from.groups:
@@ -75,9 +88,72 @@ def import_blend(path, linked=True):
     for obj in parent_objs:
         process_object(obj)
 
+    templates = [object_template(obj) for obj in parent_objs]
+    if all(template_resolves(t) for t in templates):
+        BLEND_CACHE[path, linked] = templates
     return parent_objs
 
 
+def id_key(datablock):
+    """ Key of datablock in its bpy.data collection, (name, library filepath)
+    """
+    return datablock.name, datablock.library.filepath if datablock.library else None
+
+
+def object_template(obj):
+    """ Names of the datablocks of obj and its children, with their transforms as loaded
+    """
+    return {
+        "name": obj.name,
+        "type": obj.type,
+        "data": id_key(obj.data) if obj.data else None,
+        "matrix_basis": [tuple(row) for row in obj.matrix_basis],
+        "matrix_parent_inverse": [tuple(row) for row in obj.matrix_parent_inverse],
+        "children": [object_template(child) for child in obj.children],
+    }
+
+
+def template_resolves(template):
+    """ Check if the data of every object in template still exists, only meshes and empties are kept
+    """
+    if template["type"] not in ("MESH", "EMPTY"):
+        return False
+    if template["data"] is not None and bpy.data.meshes.get(template["data"]) is None:
+        return False
+    return all(template_resolves(child) for child in template["children"])
+
+
+def object_from_template(template):
+    """ New object (and children) sharing the data named in template
+    """
+    data = bpy.data.meshes.get(template["data"]) if template["data"] is not None else None
+    obj = bpy.data.objects.new(template["name"], data)
+    obj.matrix_basis = Matrix(template["matrix_basis"])
+    obj.matrix_parent_inverse = Matrix(template["matrix_parent_inverse"])
+    for child_template in template["children"]:
+        object_from_template(child_template).parent = obj
+    return obj
+
+
+def copy_hierarchy(obj):
+    """ Copy obj and its children, the copies share data with the originals
+    """
+    copy = obj.copy()
+    for child in obj.children:
+        copy_hierarchy(child).parent = copy
+    return copy
+
+
+def instance_object(source, name):
+    """ New object named name sharing the mesh of source, with the face maps it refers to
+    """
+    obj = bpy.data.objects.new(name, source.data)
+    for fmap in source.face_maps:
+        obj.face_maps.new(name=fmap.name)
+        obj.facemap_materials.add()
+    return obj
+
+
 def align_obj(obj, dir, track='Z', up='Y'):
     obj.rotation_mode = 'QUATERNION'
     obj.rotation_quaternion = dir.to_track_quat(track, up)
@@ -1,13 +1,22 @@
 """ Adapted from https://github.com/yonghah/polyskel
 """
 
+import os
+import sys
 import math
+import multiprocessing
 import heapq
 import operator
 import itertools as it
 
 from enum import Enum
-from collections import namedtuple
+from collections import namedtuple, OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - numpy ships with blender
+    np = None
 
 
 class Vector2:
@@ -23,6 +32,10 @@ class Vector2:
 
     copy = __copy__
 
+    def __reduce__(self):
+        # -- explicit, the swizzling __getattr__ recurses on slot-less instances while unpickling
+        return (self.__class__, (self.x, self.y))
+
     def __repr__(self):
         return "Vector2(%.2f, %.2f)" % (self.x, self.y)
 
@@ -54,12 +67,16 @@ class Vector2:
         return iter((self.x, self.y))
 
     def __getattr__(self, name):
-        try:
-            return tuple([(self.x, self.y)["xy".index(c)] for c in name])
-        except ValueError:
+        # -- swizzling (v.yx), only reached when regular lookup failed
+        if name in ("x", "y") or name.strip("xy"):
             raise AttributeError(name)
+        xy = {"x": self.x, "y": self.y}
+        return tuple(xy[c] for c in name)
 
     def __add__(self, other):
+        # -- fast path for the common Vector + Vector and Point + Point
+        if other.__class__ is self.__class__:
+            return Vector2(self.x + other.x, self.y + other.y)
         if isinstance(other, Vector2):
             # Vector + Vector -> Vector
             # Vector + Point -> Point
@@ -85,6 +102,8 @@ class Vector2:
         return self
 
     def __sub__(self, other):
+        if other.__class__ is self.__class__:
+            return Vector2(self.x - other.x, self.y - other.y)
         if isinstance(other, Vector2):
             if self.__class__ is other.__class__:
                 _class = Vector2
@@ -163,7 +182,7 @@ class Vector2:
         return self
 
     def normalized(self):
-        d = self.magnitude()
+        d = math.sqrt(self.x ** 2 + self.y ** 2)
         if d:
             return Vector2(self.x / d, self.y / d)
         return self.copy()
@@ -192,6 +211,8 @@ class Vector2:
 
 
 class Geometry:
+    __slots__ = ()
+
     def _connect_unimplemented(self, other):
         raise AttributeError(
             "Cannot connect %s to %s" % (self.__class__, other.__class__)
@@ -273,6 +294,8 @@ def _connect_line2_line2(A, B):
 
 
 class Point2(Vector2, Geometry):
+    __slots__ = ()
+
     def __repr__(self):
         return "Point2(%.2f, %.2f)" % (self.x, self.y)
 
@@ -285,7 +308,7 @@ class Point2(Vector2, Geometry):
             return self.x == other.x and self.y == other.y
 
     def __hash__(self):
-        return hash(repr(self))
+        return hash((self.x, self.y))
 
     def intersect(self, other):
         return other._intersect_point2(self)
@@ -375,6 +398,8 @@ class Line2(Geometry):
 
 
 class Ray2(Line2):
+    __slots__ = ()
+
     def __repr__(self):
         return "Ray2(<%.2f, %.2f> + u<%.2f, %.2f>)" % (
             self.p.x,
@@ -388,6 +413,8 @@ class Ray2(Line2):
 
 
 class LineSegment2(Line2):
+    __slots__ = ()
+
     def __repr__(self):
         return "LineSegment2(<%.2f, %.2f> to <%.2f, %.2f>)" % (
             self.p.x,
@@ -436,6 +463,13 @@ def approximately_same(point_a, point_b):
     )
 
 
+def edge_key(edge):
+    """ Hashable key of the line an edge was cut from, its origin and direction
+    """
+    n = edge.v.normalized()
+    return (edge.p.x, edge.p.y, n.x, n.y)
+
+
 def normalize_contour(contour):
     contour = [Point2(float(x), float(y)) for (x, y) in contour]
     return [
@@ -452,25 +486,20 @@ class RoofType(Enum):
     GABLE_ROOF = 2
 
 
-SkeletonRoofType = RoofType.HIP_ROOF
-
-
-def set_roof_type_hip():
-    global SkeletonRoofType
-    SkeletonRoofType = RoofType.HIP_ROOF
-
-
-def set_roof_type_gable():
-    global SkeletonRoofType
-    SkeletonRoofType = RoofType.GABLE_ROOF
+class SkeletonBackend(Enum):
+    """ PYTHON is the reference object path, NUMPY computes the initial
+        split events of all reflex vertices in batch
+    """
 
+    PYTHON = 1
+    NUMPY = 2
 
-def roof_is_hip():
-    return SkeletonRoofType == RoofType.HIP_ROOF
 
+DefaultSkeletonBackend = SkeletonBackend.NUMPY if np is not None else SkeletonBackend.PYTHON
 
-def roof_is_gable():
-    return SkeletonRoofType == RoofType.GABLE_ROOF
+# -- tolerance of the bisector tests of split events, used when the exact tests leave a corner
+#    out of the skeleton, e.g. a courtyard corner right on the bisector of an outer corner
+CORNER_EPSILON = 1e-9
 
 
 # -- Event Type (etype) is 1
@@ -503,6 +532,8 @@ Subtree = namedtuple("Subtree", "source, height, sinks")
 
 
 class LAVertex:
+    __slots__ = ["point", "edge_left", "edge_right", "prev", "next", "lav", "_valid", "_is_reflex", "_bisector"]
+
     def __init__(self, point, edge_left, edge_right, direction_vectors=None):
         self.point = point
         self.edge_left = edge_left
@@ -534,63 +565,74 @@ class LAVertex:
     def original_edges(self):
         return self.lav._slav._original_edges
 
-    def next_event(self):
+    @property
+    def original_lines(self):
+        return self.lav._slav._original_lines
+
+    @property
+    def original_normals(self):
+        return self.lav._slav._original_normals
+
+    def split_events(self):
+        """ Candidate split events of this vertex against every original edge
+        """
+        if not self.is_reflex:
+            return []
+
         events = []
-        if self.is_reflex:
-            for edge in self.original_edges:
-                if edge.edge == self.edge_left or edge.edge == self.edge_right:
+        eps = self.lav._slav._corner_epsilon
+        left_n = self.edge_left.v.normalized()
+        right_n = self.edge_right.v.normalized()
+        left_line = Line2(self.edge_left)
+        right_line = Line2(self.edge_right)
+        for edge, edge_line, (edge_n, left_bisector_n, right_bisector_n) in zip(
+            self.original_edges, self.original_lines, self.original_normals
+        ):
+            if edge.edge == self.edge_left or edge.edge == self.edge_right:
+                continue
+
+            leftdot = abs(left_n.dot(edge_n))
+            rightdot = abs(right_n.dot(edge_n))
+            self_line = left_line if leftdot < rightdot else right_line
+
+            i = self_line.intersect(edge_line)
+            if i is not None and not approximately_equals(i, self.point):
+                # locate candidate b
+                linvec = (self.point - i).normalized()
+                edvec = edge_n
+                if linvec.dot(edvec) < 0:
+                    edvec = -edvec
+
+                bisecvec = edvec + linvec
+                if abs(bisecvec) == 0:
                     continue
+                bisector = Line2(i, bisecvec)
+                b = bisector.intersect(self.bisector)
 
-                leftdot = abs(
-                    self.edge_left.v.normalized().dot(edge.edge.v.normalized())
+                if b is None:
+                    continue
+
+                xleft = (
+                    cross(left_bisector_n, (b - edge.bisector_left.p).normalized()) > -eps
                 )
-                rightdot = abs(
-                    self.edge_right.v.normalized().dot(edge.edge.v.normalized())
+                xright = (
+                    cross(right_bisector_n, (b - edge.bisector_right.p).normalized()) < eps
                 )
-                selfedge = self.edge_left if leftdot < rightdot else self.edge_right
-
-                i = Line2(selfedge).intersect(Line2(edge.edge))
-                if i is not None and not approximately_equals(i, self.point):
-                    # locate candidate b
-                    linvec = (self.point - i).normalized()
-                    edvec = edge.edge.v.normalized()
-                    if linvec.dot(edvec) < 0:
-                        edvec = -edvec
-
-                    bisecvec = edvec + linvec
-                    if abs(bisecvec) == 0:
-                        continue
-                    bisector = Line2(i, bisecvec)
-                    b = bisector.intersect(self.bisector)
-
-                    if b is None:
-                        continue
-
-                    xleft = (
-                        cross(
-                            edge.bisector_left.v.normalized(),
-                            (b - edge.bisector_left.p).normalized(),
-                        )
-                        > 0
-                    )
-                    xright = (
-                        cross(
-                            edge.bisector_right.v.normalized(),
-                            (b - edge.bisector_right.p).normalized(),
-                        )
-                        < 0
-                    )
-                    xedge = (
-                        cross(edge.edge.v.normalized(), (b - edge.edge.p).normalized())
-                        < 0
-                    )
+                xedge = cross(edge_n, (b - edge.edge.p).normalized()) < 0
 
-                    if not (xleft and xright and xedge):
-                        continue
+                if not (xleft and xright and xedge):
+                    continue
 
-                    events.append(
-                        SplitEvent(Line2(edge.edge).distance(b), b, 0, self, edge.edge)
-                    )
+                events.append(
+                    SplitEvent(edge_line.distance(b), b, 0, self, edge.edge)
+                )
+        return events
+
+    def next_event(self, split_events=None):
+        """ Closest event of this vertex, split_events can be passed in when
+            they were precomputed in batch (see batch_split_events)
+        """
+        events = self.split_events() if split_events is None else list(split_events)
 
         i_prev = self.bisector.intersect(self.prev.bisector)
         i_next = self.bisector.intersect(self.next.bisector)
@@ -646,10 +688,16 @@ class LAVertex:
 
 
 class SLAV:
-    def __init__(self, polygon, holes):
+    __slots__ = ["_roof_type", "_corner_epsilon", "_edge_index", "_lavs", "_original_edges", "_original_lines", "_original_normals", "_original_points"]
+
+    def __init__(self, polygon, holes, roof_type=RoofType.HIP_ROOF, corner_epsilon=0.0):
+        self._roof_type = roof_type
+        self._corner_epsilon = corner_epsilon
         contours = [normalize_contour(polygon)]
         contours.extend([normalize_contour(hole) for hole in holes])
 
+        # active vertices bucketed by the edges they lie on, see _vertices_on_edge
+        self._edge_index = {}
         self._lavs = [LAV.from_polygon(contour, self) for contour in contours]
 
         # store original polygon edges for calculating split events
@@ -662,6 +710,17 @@ class SLAV:
             for vertex in it.chain.from_iterable(self._lavs)
         ]
 
+        # infinite lines of the original edges, and the normalized direction of each
+        # original edge and its bisectors, used by split events
+        self._original_lines = [Line2(e.edge) for e in self._original_edges]
+        self._original_normals = [
+            (e.edge.v.normalized(), e.bisector_left.v.normalized(), e.bisector_right.v.normalized())
+            for e in self._original_edges
+        ]
+
+        # endpoints of the original edges, used by gable processing of edge events
+        self._original_points = {p for e in self._original_edges for p in (e.edge.p1, e.edge.p2)}
+
     def __iter__(self):
         for lav in self._lavs:
             yield lav
@@ -672,6 +731,23 @@ class SLAV:
     def empty(self):
         return len(self._lavs) == 0
 
+    def _index_vertex(self, vertex):
+        """ Register vertex under the keys of both its edges
+        """
+        for edge in (vertex.edge_left, vertex.edge_right):
+            self._edge_index.setdefault(edge_key(edge), {})[vertex] = None
+
+    def _vertices_on_edge(self, edge):
+        """ Return the active vertices having edge as their left or right edge,
+            pruning the ones invalidated since they were indexed
+        """
+        bucket = self._edge_index.get(edge_key(edge))
+        if not bucket:
+            return []
+        for vertex in [v for v in bucket if not v.is_valid]:
+            del bucket[vertex]
+        return list(bucket)
+
     def handle_edge_event(self, event):
         sinks = []
         events = []
@@ -694,13 +770,9 @@ class SLAV:
                 events.append(next_event)
 
         # -- gable roof processing
-        if roof_is_gable():
-            original_points = []
-            for e in self._original_edges:
-                original_points.extend([e.edge.p1, e.edge.p2])
-
+        if self._roof_type == RoofType.GABLE_ROOF:
             len_sinks = len(sinks)
-            set_diff = set(sinks) - set(original_points)
+            set_diff = set(sinks) - self._original_points
             len_diff = len(list(set_diff))
 
             midpoint = event.intersection_point
@@ -724,7 +796,7 @@ class SLAV:
         x = None  # right vertex
         y = None  # left vertex
         norm = event.opposite_edge.v.normalized()
-        for v in it.chain.from_iterable(self._lavs):
+        for v in self._vertices_on_edge(event.opposite_edge):
             if (
                 norm == v.edge_left.v.normalized()
                 and event.opposite_edge.p == v.edge_left.p
@@ -769,6 +841,8 @@ class SLAV:
         v2 = LAVertex(
             event.intersection_point, event.opposite_edge, event.vertex.edge_right
         )
+        self._index_vertex(v1)
+        self._index_vertex(v2)
 
         v1.prev = event.vertex.prev
         v1.next = x
@@ -809,6 +883,8 @@ class SLAV:
 
 
 class LAV:
+    __slots__ = ["head", "_slav", "_len"]
+
     def __init__(self, slav):
         self.head = None
         self._slav = slav
@@ -823,6 +899,7 @@ class LAV:
                 point, LineSegment2(prev, point), LineSegment2(point, next)
             )
             vertex.lav = lav
+            slav._index_vertex(vertex)
             if lav.head is None:
                 lav.head = vertex
                 vertex.prev = vertex.next = vertex
@@ -857,6 +934,7 @@ class LAV:
             (vertex_b.bisector.v.normalized(), vertex_a.bisector.v.normalized()),
         )
         replacement.lav = self
+        self._slav._index_vertex(replacement)
 
         if self.head in [vertex_a, vertex_b]:
             self.head = replacement
@@ -899,6 +977,8 @@ class LAV:
 
 
 class EventQueue:
+    __slots__ = ["__data"]
+
     def __init__(self):
         self.__data = []
 
@@ -924,7 +1004,111 @@ class EventQueue:
             print(item)
 
 
-def skeletonize(polygon, holes=None):
+def _np_normalized(v):
+    """ Row-wise Vector2.normalized, zero vectors are returned as is
+    """
+    d = np.sqrt(v[..., 0] ** 2 + v[..., 1] ** 2)
+    safe = np.where(d == 0, 1.0, d)[..., None]
+    return np.where(d[..., None] != 0, v / safe, v)
+
+
+def _np_cross(a, b):
+    return a[..., 0] * b[..., 1] - b[..., 0] * a[..., 1]
+
+
+def _np_dot(a, b):
+    return a[..., 0] * b[..., 0] + a[..., 1] * b[..., 1]
+
+
+def _np_intersect_lines(ap, av, bp, bv):
+    """ Vectorized _intersect_line2_line2, returns (point, ua, not_parallel)
+    """
+    d = bv[..., 1] * av[..., 0] - bv[..., 0] * av[..., 1]
+    dy = ap[..., 1] - bp[..., 1]
+    dx = ap[..., 0] - bp[..., 0]
+    ua = (bv[..., 0] * dy - bv[..., 1] * dx) / d
+    return ap + ua[..., None] * av, ua, d != 0
+
+
+def batch_split_events(vertices, original_edges, chunk_size=1 << 18, corner_epsilon=0.0):
+    """ Vectorized LAVertex.split_events for many vertices at once.
+
+    Mirrors the arithmetic of the object path operation by operation, so both
+    backends agree on the resulting events. Returns, for each vertex, a list
+    holding its closest split event (or an empty list), which is all that
+    LAVertex.next_event needs.
+    """
+    result = [[] for _ in vertices]
+    reflex = [i for i, v in enumerate(vertices) if v.is_reflex]
+    if not reflex or not original_edges:
+        return result
+
+    def xy(points):
+        return np.array([(p.x, p.y) for p in points], dtype=float)
+
+    ep = xy(e.edge.p for e in original_edges)
+    ev = xy(e.edge.v for e in original_edges)
+    en = _np_normalized(ev)
+    blp = xy(e.bisector_left.p for e in original_edges)
+    bln = _np_normalized(xy(e.bisector_left.v for e in original_edges))
+    brp = xy(e.bisector_right.p for e in original_edges)
+    brn = _np_normalized(xy(e.bisector_right.v for e in original_edges))
+
+    step = max(1, chunk_size // len(original_edges))
+    for start in range(0, len(reflex), step):
+        rows = [vertices[i] for i in reflex[start : start + step]]
+        point = xy(v.point for v in rows)[:, None]
+        lp = xy(v.edge_left.p for v in rows)[:, None]
+        lv = xy(v.edge_left.v for v in rows)[:, None]
+        rp = xy(v.edge_right.p for v in rows)[:, None]
+        rv = xy(v.edge_right.v for v in rows)[:, None]
+        bv = xy(v.bisector.v for v in rows)[:, None]
+
+        with np.errstate(divide="ignore", invalid="ignore"):
+            # -- intersect the least parallel vertex edge with each original edge
+            leftdot = np.abs(_np_dot(_np_normalized(lv), en))
+            rightdot = np.abs(_np_dot(_np_normalized(rv), en))
+            use_left = (leftdot < rightdot)[..., None]
+            sp = np.where(use_left, lp, rp)
+            sv = np.where(use_left, lv, rv)
+            i, _, valid = _np_intersect_lines(ep, ev, sp, sv)
+
+            # -- approximately_equals(i, point)
+            diff = i - point
+            near = np.all(i == point, axis=-1) | (
+                np.sqrt(_np_dot(diff, diff))
+                <= np.maximum(np.sqrt(_np_dot(i, i)), np.sqrt(_np_dot(point, point))) * 0.001
+            )
+            valid &= ~near
+
+            # -- locate candidate b
+            linvec = _np_normalized(point - i)
+            edvec = np.where((_np_dot(linvec, en) < 0)[..., None], -en, en)
+            bisecvec = edvec + linvec
+            valid &= np.sqrt(_np_dot(bisecvec, bisecvec)) != 0
+            b, ua, not_parallel = _np_intersect_lines(point, bv, i, bisecvec)
+            valid &= not_parallel & (ua >= 0.0)
+
+            valid &= _np_cross(bln, _np_normalized(b - blp)) > -corner_epsilon
+            valid &= _np_cross(brn, _np_normalized(b - brp)) < corner_epsilon
+            valid &= _np_cross(en, _np_normalized(b - ep)) < 0
+
+            # -- closest candidate, measured like LAVertex.next_event does
+            to_b = b - point
+            key = np.where(valid, np.sqrt(_np_dot(to_b, to_b)), np.inf)
+            best = np.argmin(key, axis=1)
+
+        for row, (vertex, j) in enumerate(zip(rows, best)):
+            if not valid[row, j]:
+                continue
+            edge = original_edges[j]
+            b_point = Point2(float(b[row, j, 0]), float(b[row, j, 1]))
+            event = SplitEvent(Line2(edge.edge).distance(b_point), b_point, 0, vertex, edge.edge)
+            result[reflex[start + row]] = [event]
+    return result
+
+
+def skeletonize(polygon, holes=None, roof_type=RoofType.HIP_ROOF, backend=None):
     """
     Compute the straight skeleton of a polygon.
 
@@ -933,15 +1117,40 @@ def skeletonize(polygon, holes=None):
 
     Returns the straight skeleton as a list of "subtrees", which are in the form of (source, height, sinks),
     where source is the highest points, height is its height, and sinks are the point connected to the source.
+
+    roof_type is the RoofType deciding how edge events are resolved, backend is a SkeletonBackend used
+    to seed the initial events, defaults to DefaultSkeletonBackend.
     """
-    slav = SLAV(polygon, holes)
+    holes = holes or []
+    output = _skeletonize(polygon, holes, roof_type, backend or DefaultSkeletonBackend)
+    if untouched_points(output, polygon, holes):
+        # -- split events exactly on a bisector were rejected, retry accepting them
+        output = _skeletonize(polygon, holes, roof_type, backend or DefaultSkeletonBackend, CORNER_EPSILON)
+    return output
+
+
+def untouched_points(skeleton, polygon, holes=None):
+    """ Points of the polygon and holes that no arc of skeleton ends at
+    """
+    sinks = {(sink.x, sink.y) for arc in skeleton for sink in arc.sinks}
+    contours = [normalize_contour(c) for c in it.chain([polygon], holes or [])]
+    return [p for p in it.chain.from_iterable(contours) if (p.x, p.y) not in sinks]
+
+
+def _skeletonize(polygon, holes, roof_type, backend, corner_epsilon=0.0):
+    slav = SLAV(polygon, holes, roof_type, corner_epsilon)
     output = []
     prioque = EventQueue()
 
-    for lav in slav:
-        for vertex in lav:
-            v = vertex.next_event()
-            prioque.put(v)
+    vertices = [vertex for lav in slav for vertex in lav]
+    if backend == SkeletonBackend.NUMPY:
+        split_events = batch_split_events(vertices, slav._original_edges, corner_epsilon=corner_epsilon)
+    else:
+        split_events = [None] * len(vertices)
+
+    for vertex, splits in zip(vertices, split_events):
+        v = vertex.next_event(splits)
+        prioque.put(v)
 
     while not (prioque.empty() or slav.empty()):
         i = prioque.get()
@@ -961,3 +1170,96 @@ def skeletonize(polygon, holes=None):
             output.append(arc)
 
     return output
+
+
+SKELETON_CACHE_SIZE = 64
+
+
+def footprint_key(polygon, holes=None, precision=6):
+    """ Canonical, translation invariant form of a footprint.
+
+    Every contour is rotated to start at its lowest (x, y) point and all of them
+    are expressed relative to the start of the polygon. Returns the key and the
+    origin that was subtracted.
+    """
+
+    def canonical(contour):
+        contour = [(float(x), float(y)) for (x, y) in contour]
+        start = contour.index(min(contour))
+        return contour[start:] + contour[:start]
+
+    polygon = canonical(polygon)
+    ox, oy = polygon[0]
+
+    def relative(contour):
+        return tuple((round(x - ox, precision), round(y - oy, precision)) for (x, y) in contour)
+
+    holes = tuple(sorted(relative(canonical(hole)) for hole in holes or []))
+    return (relative(polygon), holes), (ox, oy)
+
+
+# -- skeletons relative to the origin of their footprint_key, least recently used first
+SKELETON_CACHE = OrderedDict()
+
+
+def _translated(skeleton, dx, dy):
+    return [
+        Subtree(
+            Point2(arc.source.x + dx, arc.source.y + dy),
+            arc.height,
+            [Point2(sink.x + dx, sink.y + dy) for sink in arc.sinks],
+        )
+        for arc in skeleton
+    ]
+
+
+def skeletonize_cached(polygon, holes=None, roof_type=RoofType.HIP_ROOF):
+    """ Memoized skeletonize.
+
+    Footprints that only differ by a translation share a cache entry, the
+    least recently used entries are evicted past SKELETON_CACHE_SIZE. A miss is
+    computed on the footprint as given, the key only decides which footprints
+    share a result. Returns fresh subtrees every call, so callers are free to
+    modify them.
+    """
+    key, (ox, oy) = footprint_key(polygon, holes)
+    key = (key, roof_type)
+    cached = SKELETON_CACHE.get(key)
+    if cached is not None:
+        SKELETON_CACHE.move_to_end(key)
+        return _translated(cached, ox, oy)
+
+    skeleton = skeletonize(polygon, holes, roof_type)
+    SKELETON_CACHE[key] = tuple(_translated(skeleton, -ox, -oy))
+    while len(SKELETON_CACHE) > SKELETON_CACHE_SIZE:
+        SKELETON_CACHE.popitem(last=False)
+    return skeleton
+
+
+def _skeletonize_footprint(args):
+    (polygon, holes), roof_type = args
+    return skeletonize(polygon, holes, roof_type)
+
+
+def skeletonize_many(footprints, roof_type=RoofType.HIP_ROOF, workers=None):
+    """ Skeletonize many independent footprints, given as (polygon, holes) pairs.
+
+    The footprints are spread over a pool of worker processes, os.cpu_count() of
+    them when workers is None. workers=1 computes them in this process. Returns
+    the skeletons in the order of footprints.
+
+    Workers are forked, a spawned one would import this module through the addon
+    package, which needs bpy. Forking blender is only safe on Linux, elsewhere the
+    footprints are computed in this process.
+    """
+    tasks = [(footprint, roof_type) for footprint in footprints]
+    workers = workers or os.cpu_count() or 1
+    if not sys.platform.startswith("linux"):
+        workers = 1
+    if workers == 1 or len(tasks) < 2:
+        return [_skeletonize_footprint(task) for task in tasks]
+
+    chunksize = max(1, len(tasks) // (workers * 4))
+    context = multiprocessing.get_context("fork")
+    with ProcessPoolExecutor(max_workers=workers, mp_context=context) as executor:
+        return list(executor.map(_skeletonize_footprint, tasks, chunksize=chunksize))